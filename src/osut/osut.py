@@ -27,12 +27,14 @@
 # OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
 # OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 
-import re
 import math
+import types
+import itertools
 import collections
 import openstudio
 from oslg import oslg
 from dataclasses import dataclass
+from operator import itemgetter
 
 @dataclass(frozen=True)
 class _CN:
@@ -56,9 +58,36 @@ class _CN:
     RMAX =  1.0 / UMIN   # material RSi upper limit, 100.000 (or R-IP 567.80)
 CN = _CN()
 
+# OpenStudio SDK version, as an integer (e.g. 321 for "3.2.1").
+_osv = int("".join(openstudio.openStudioVersion().split(".")))
+
 # General surface orientations (see 'facets' method).
 _sidz = ("bottom", "top", "north", "east", "south", "west")
 
+# Default construction getters, per valid (lowercase) surface & sub surface
+# type (see 'holdsConstruction'). Keys must match (lowercased) OpenStudio
+# Surface 'validSurfaceTypeValues' & SubSurface 'validSubSurfaceTypeValues':
+# any other type is logged as an invalid surface type. Update both tables if
+# OpenStudio introduces new types (see unit tests).
+_dsc   = openstudio.model.DefaultSurfaceConstructions
+_dssc  = openstudio.model.DefaultSubSurfaceConstructions
+_surfs = dict(roofceiling             = _dsc.roofCeilingConstruction,
+              floor                   = _dsc.floorConstruction,
+              wall                    = _dsc.wallConstruction)
+_subs  = dict(fixedwindow             = _dssc.fixedWindowConstruction,
+              operablewindow          = _dssc.operableWindowConstruction,
+              door                    = _dssc.doorConstruction,
+              glassdoor               = _dssc.glassDoorConstruction,
+              overheaddoor            = _dssc.overheadDoorConstruction,
+              skylight                = _dssc.skylightConstruction,
+              tubulardaylightdome     = _dssc.tubularDaylightDomeConstruction,
+              tubulardaylightdiffuser =
+                  _dssc.tubularDaylightDiffuserConstruction)
+
+# Skylight pattern geometry, per roof subset (see 'addSkyLights').
+_Pattern = collections.namedtuple(
+    "_Pattern", ("tight", "cols", "rows", "wx", "wy", "wxl", "wyl", "dX", "dY"))
+
 # This first set of utilities support OpenStudio materials, constructions,
 # construction sets, etc. If relying on default StandardOpaqueMaterial:
 #   - roughness            (rgh) : "Smooth"
@@ -100,6 +129,9 @@ _mats = dict(
         door = {}  # single composite material (45mm insulated steel door)
     )
 
+# Generated construction layer: material, thickness & ID (see genConstruction).
+_Layer = collections.namedtuple("_Layer", ("mat", "d", "id"))
+
 # Default inside + outside air film resistances (m2.K/W).
 _film = dict(
       shading = 0.000, # NA
@@ -196,6 +228,24 @@ _mats["door"     ]["k"  ] =    0.080
 _mats["door"     ]["rho"] =  600.000
 _mats["door"     ]["cp" ] = 1000.000
 
+# Opaque material setters, per stored material key (see genConstruction).
+_sopm  = openstudio.model.StandardOpaqueMaterial
+_msets = dict(rgh = _sopm.setRoughness,
+              k   = _sopm.setConductivity,
+              rho = _sopm.setDensity,
+              cp  = _sopm.setSpecificHeat,
+              thm = _sopm.setThermalAbsorptance,
+              sol = _sopm.setSolarAbsorptance,
+              vis = _sopm.setVisibleAbsorptance)
+
+
+# Read-only views of the above, for direct (call-free) access.
+SIDZ = _sidz
+MASS = _mass
+MATS = types.MappingProxyType(_mats)
+FILM = types.MappingProxyType(_film)
+UO   = types.MappingProxyType(_uo)
+
 
 def sidz() -> tuple:
     """Returns available 'sidz' keywords."""
@@ -240,31 +290,31 @@ def each_cons(it, n):
     # James Wong's Python workaround implementation:
     # stackoverflow.com/questions/5878403/python-equivalent-to-rubys-each-cons
 
-    # Convert as iterator.
-    it  = iter(it)
-    deq = collections.deque()
+    if n <= 0: return
 
-    # Insert first n items to a list first.
-    for _ in range(n):
-        try:
-            deq.append(next(it))
-        except StopIteration:
-            for _ in range(n - len(deq)):
-                deq.append(None)
-            yield tuple(deq)
-            return
+    # Convert as iterator, and fetch first n items.
+    it   = iter(it)
+    head = tuple(itertools.islice(it, n))
 
-    yield tuple(deq)
+    # If short, pad with None.
+    if len(head) < n:
+        yield head + (None,) * (n - len(head))
+        return
 
-    # Main loop.
-    while True:
-        try:
-            val = next(it)
-        except StopIteration:
-            return
-        deq.popleft()
-        deq.append(val)
-        yield tuple(deq)
+    it = itertools.chain(head, it)
+
+    # Pairs: native itertools.pairwise (Python 3.10+), if available.
+    if n == 2 and hasattr(itertools, "pairwise"):
+        for items in itertools.pairwise(it): yield items
+        return
+
+    # Main loop: n staggered copies of the sequence, zipped as n-sized items.
+    its = itertools.tee(it, n)
+
+    for i, itt in enumerate(its):
+        next(itertools.islice(itt, i, i), None)
+
+    for items in zip(*its): yield items
 
 
 def clamp(value, minimum, maximum) -> float:
@@ -339,11 +389,11 @@ def filmResistances(type="wall", tilt=2*math.pi) -> float:
     except:
         return oslg.mismatch("surface type", type, str, mth, CN.DBG, 0.0)
 
-    if type not in film():
+    if type not in _film:
         return oslg.invalid("surface type", mth, 1, CN.DBG, 0.0)
 
     # Generic, tilt-independent values.
-    r = film()[type]
+    r = _film[type]
 
     if type == "shading":
         return r
@@ -411,11 +461,14 @@ def thickness(lc=None) -> float:
 
     if not isinstance(lc, cl):
         return oslg.mismatch("lc", lc, cl, mth, CN.DBG, 0.0)
-    if not areStandardOpaqueLayers(lc):
-        oslg.log(CN.ERR, "holding non-StandardOpaqueMaterial(s) %s" % mth)
-        return d
 
-    for m in lc.layers(): d += m.thickness()
+    # Single pass: validate (see 'areStandardOpaqueLayers') while summing.
+    for m in lc.layers():
+        if not m.to_StandardOpaqueMaterial():
+            oslg.log(CN.ERR, "holding non-StandardOpaqueMaterial(s) %s" % mth)
+            return 0.0
+
+        d += m.thickness()
 
     return d
 
@@ -453,10 +506,11 @@ def glazingAirFilmRSi(usi=5.85) -> float:
     mth = "osut.glazingAirFilmRSi"
     val = 0.1216
 
-    try:
-        usi = float(usi)
-    except:
-        return oslg.mismatch("usi", usi, float, mth, CN.DBG, val)
+    if not isinstance(usi, float):
+        try:
+            usi = float(usi)
+        except:
+            return oslg.mismatch("usi", usi, float, mth, CN.DBG, val)
 
     if usi > 8.0:
         return oslg.invalid("usi", mth, 1, CN.WRN, val)
@@ -473,6 +527,21 @@ def glazingAirFilmRSi(usi=5.85) -> float:
     return rsi + 1 / (1.788041 * usi - 2.886625)
 
 
+# Material downcasts, per layer IDD object type (see 'rsi').
+_mtl  = openstudio.model.Material
+_rsiz = {
+    "OS_Material"                          : _mtl.to_StandardOpaqueMaterial,
+    "OS_Material_NoMass"                   : _mtl.to_MasslessOpaqueMaterial,
+    "OS_Material_RoofVegetation"           : _mtl.to_RoofVegetation,
+    "OS_Material_AirGap"                   : _mtl.to_AirGap,
+    "OS_WindowMaterial_SimpleGlazingSystem": _mtl.to_SimpleGlazing,
+    "OS_WindowMaterial_Glazing"            : _mtl.to_StandardGlazing,
+    "OS_WindowMaterial_Gas"                : _mtl.to_Gas,
+    "OS_WindowMaterial_GasMixture"         : _mtl.to_GasMixture,
+    "OS_WindowMaterial_Glazing_RefractionExtinctionMethod":
+        _mtl.to_RefractionExtinctionGlazing}
+
+
 def rsi(lc=None, film=0.0, t=0.0) -> float:
     """Returns a construction's 'standard calc' thermal resistance (m2•K/W),
     which includes air film resistances. It excludes insulating effects of
@@ -498,15 +567,17 @@ def rsi(lc=None, film=0.0, t=0.0) -> float:
     if not isinstance(lc, cl):
         return oslg.mismatch("lc", lc, cl, mth, CN.DBG, 0.0)
 
-    try:
-        film = float(film)
-    except:
-        return oslg.mismatch("film", film, float, mth, CN.DBG, 0.0)
+    if not isinstance(film, float):
+        try:
+            film = float(film)
+        except:
+            return oslg.mismatch("film", film, float, mth, CN.DBG, 0.0)
 
-    try:
-        t = float(t)
-    except:
-        return oslg.mismatch("temp K", t, float, mth, CN.DBG, 0.0)
+    if not isinstance(t, float):
+        try:
+            t = float(t)
+        except:
+            return oslg.mismatch("temp K", t, float, mth, CN.DBG, 0.0)
 
     t += 273.0 # °C to K
 
@@ -517,27 +588,20 @@ def rsi(lc=None, film=0.0, t=0.0) -> float:
 
     rsi = film
 
+    # One IDD type lookup & one downcast per layer (see '_rsiz').
     for m in lc.layers():
-        if m.to_SimpleGlazing():
-            return 1 / m.to_SimpleGlazing().get().uFactor()
-        elif m.to_StandardGlazing():
-            rsi += m.to_StandardGlazing().get().thermalResistance()
-        elif m.to_RefractionExtinctionGlazing():
-            rsi += m.to_RefractionExtinctionGlazing().get().thermalResistance()
-        elif m.to_Gas():
-            rsi += m.to_Gas().get().getThermalResistance(t)
-        elif m.to_GasMixture():
-            rsi += m.to_GasMixture().get().getThermalResistance(t)
-
-        # Opaque materials next.
-        if m.to_StandardOpaqueMaterial():
-            rsi += m.to_StandardOpaqueMaterial().get().thermalResistance()
-        elif m.to_MasslessOpaqueMaterial():
-            rsi += m.to_MasslessOpaqueMaterial()
-        elif m.to_RoofVegetation():
-            rsi += m.to_RoofVegetation().get().thermalResistance()
-        elif m.to_AirGap():
-            rsi += m.to_AirGap().get().thermalResistance()
+        typ = m.iddObjectType().valueName()
+
+        if typ not in _rsiz: continue
+
+        m = _rsiz[typ](m).get()
+
+        if typ == "OS_WindowMaterial_SimpleGlazingSystem":
+            return 1 / m.uFactor()
+        elif typ in ("OS_WindowMaterial_Gas", "OS_WindowMaterial_GasMixture"):
+            rsi += m.getThermalResistance(t)
+        else:
+            rsi += m.thermalResistance()
 
     return rsi
 
@@ -563,37 +627,35 @@ def insulatingLayer(lc=None) -> dict:
     mth = "osut.insulatingLayer"
     cl  = openstudio.model.LayeredConstruction
     res = dict(index=None, type=None, r=0.0)
-    i   = 0  # iterator
 
     if not isinstance(lc, cl):
         return oslg.mismatch("lc", lc, cl, mth, CN.DBG, res)
 
-    for l in lc.layers():
-        if l.to_MasslessOpaqueMaterial():
-            l = l.to_MasslessOpaqueMaterial().get()
+    for i, l in enumerate(lc.layers()):
+        m = l.to_MasslessOpaqueMaterial()
 
-            if l.thermalResistance() < 0.001 or l.thermalResistance() < res["r"]:
-                i += 1
-                continue
-            else:
-                res["r"    ] = m.thermalResistance()
-                res["index"] = i
-                res["type" ] = "massless"
+        if m:
+            r = m.get().thermalResistance()
 
-        if l.to_StandardOpaqueMaterial():
-            l = l.to_StandardOpaqueMaterial().get()
-            k = l.thermalConductivity()
-            d = l.thickness()
+            if r < 0.001 or r < res["r"]: continue
 
-            if (d < 0.003) or (k > 3.0) or (d / k < res["r"]):
-                i += 1
-                continue
-            else:
-                res["r"    ] = d / k
-                res["index"] = i
-                res["type" ] = "standard"
+            res["r"    ] = r
+            res["index"] = i
+            res["type" ] = "massless"
+            continue
+
+        m = l.to_StandardOpaqueMaterial()
+
+        if m:
+            m = m.get()
+            k = m.thermalConductivity()
+            d = m.thickness()
 
-        i += 1
+            if d < 0.003 or k > 3.0 or d / k < res["r"]: continue
+
+            res["r"    ] = d / k
+            res["index"] = i
+            res["type" ] = "standard"
 
     return res
 
@@ -852,10 +914,10 @@ def genConstruction(model=None, specs=dict()):
 
     if not ide:
         ide = "OSut.CON." + specs["type"]
-    if specs["type"] not in uo():
+    if specs["type"] not in _uo:
         return oslg.invalid("surface type", mth, 2, CN.ERR)
 
-    if "uo" not in specs: specs["uo"] = uo()[ specs["type"] ] # can be None
+    if "uo" not in specs: specs["uo"] = _uo[specs["type"]] # can be None
     u = specs["uo"]
 
     if u:
@@ -870,277 +932,214 @@ def genConstruction(model=None, specs=dict()):
             oslg.log(CN.ERR, "Resetting Uo %.3f to %.3f (%s)" % (u0, u, mth))
 
     # Optional specs. Log/reset if invalid.
-    if "clad"   not in specs: specs["clad"  ] = "light" # exterior
-    if "frame"  not in specs: specs["frame" ] = "light"
-    if "finish" not in specs: specs["finish"] = "light" # interior
-    if specs["clad"  ] not in mass(): oslg.log(CN.WRN, "Reset: light cladding")
-    if specs["frame" ] not in mass(): oslg.log(CN.WRN, "Reset: light framing")
-    if specs["finish"] not in mass(): oslg.log(CN.WRN, "Reset: light finish")
-    if specs["clad"  ] not in mass(): specs["clad"  ] = "light"
-    if specs["frame" ] not in mass(): specs["frame" ] = "light"
-    if specs["frame" ] not in mass(): specs["finish"] = "light"
-
-    flm = film()[ specs["type"] ]
+    for k, tag in (("clad",   "cladding"),  # exterior
+                   ("frame",  "framing" ),
+                   ("finish", "finish"  )): # interior
+        if specs.setdefault(k, "light") not in _mass:
+            oslg.log(CN.WRN, "Reset: light %s" % tag)
+            specs[k] = "light"
+
+    typ    = specs["type"  ]
+    clad   = specs["clad"  ]
+    frame  = specs["frame" ]
+    finish = specs["finish"]
+    flm    = _film[typ]
 
     # Layered assembly (max 4 layers):
     #   - cladding
     #   - intermediate sheathing
     #   - composite insulating/framing
     #   - interior finish
-    a = dict(clad={}, sheath={}, compo={}, finish={}, glazing={})
+    a = dict(clad=None, sheath=None, compo=None, finish=None, glazing={})
 
-    if specs["type"] == "shading":
+    if typ == "shading":
         mt = "material"
         d  = 0.015
-        a["compo"]["mat"] = mats()[mt]
-        a["compo"]["d"  ] = d
-        a["compo"]["id" ] = "OSut." + mt + ".%03d" % int(d * 1000)
+        a["compo"] = _Layer(_mats[mt], d, "OSut.%s.%03d" % (mt, d * 1000))
 
-    elif specs["type"] == "ceiling":
-        if specs["clad"] != "none":
+    elif typ == "ceiling":
+        if clad != "none":
             mt = "concrete"
             d  = 0.015
-            if specs["clad"] == "light":  mt = "material"
-            if specs["clad"] == "medium":  d = 0.100
-            if specs["clad"] == "heavy":   d = 0.200
-            a["clad"]["mat"] = mats()[mt]
-            a["clad"]["d"  ] = d
-            a["clad"]["id" ] = "OSut." + mt + ".%03d" % int(d * 1000)
+            if clad == "light":  mt = "material"
+            if clad == "medium":  d = 0.100
+            if clad == "heavy":   d = 0.200
+            a["clad"] = _Layer(_mats[mt], d, "OSut.%s.%03d" % (mt, d * 1000))
 
         mt = "mineral"
         d  = 0.100
-        if specs["frame"] == "medium": mt = "polyiso"
-        if specs["frame"] == "heavy":  mt = "cellulose"
-        if not u:                      mt = "material"
-        if not u:                       d = 0.015
-        a["compo"]["mat"] = mats()[mt]
-        a["compo"]["d"  ] = d
-        a["compo"]["id" ] = "OSut." + mt + ".%03d" % int(d * 1000)
-
-        if specs["finish"] != "none":
+        if frame == "medium": mt = "polyiso"
+        if frame == "heavy":  mt = "cellulose"
+        if not u:             mt = "material"
+        if not u:              d = 0.015
+        a["compo"] = _Layer(_mats[mt], d, "OSut.%s.%03d" % (mt, d * 1000))
+
+        if finish != "none":
             mt = "material"
             d  = 0.015
-            a["finish"]["mat"] = mats()[mt]
-            a["finish"]["d"  ] = d
-            a["finish"]["id" ] = "OSut." + mt + ".%03d" % int(d * 1000)
+            a["finish"] = _Layer(_mats[mt], d, "OSut.%s.%03d" % (mt, d * 1000))
 
-    elif specs["type"] == "partition":
-        if specs["clad"] != "none":
+    elif typ == "partition":
+        if clad != "none":
             mt = "drywall"
             d  = 0.015
-            a["clad"]["mat"] = mats()[mt]
-            a["clad"]["d"  ] = d
-            a["clad"]["id" ] = "OSut." + mt + ".%03d" % int(d * 1000)
+            a["clad"] = _Layer(_mats[mt], d, "OSut.%s.%03d" % (mt, d * 1000))
 
         mt = "concrete"
         d  = 0.015
-        if specs["frame"] == "light": mt = "material"
-        if u:                         mt = "mineral"
-        if specs["frame"] == "medium": d = 0.100
-        if specs["frame"] == "heavy":  d = 0.200
-        if u:                          d = 0.100
-        a["compo"]["mat"] = mats()[mt]
-        a["compo"]["d"  ] = d
-        a["compo"]["id" ] = "OSut." + mt + ".%03d" % int(d * 1000)
-
-        if specs["finish"] != "none":
+        if frame == "light": mt = "material"
+        if u:                mt = "mineral"
+        if frame == "medium": d = 0.100
+        if frame == "heavy":  d = 0.200
+        if u:                 d = 0.100
+        a["compo"] = _Layer(_mats[mt], d, "OSut.%s.%03d" % (mt, d * 1000))
+
+        if finish != "none":
             mt = "drywall"
             d  = 0.015
-            a["finish"]["mat"] = mats()[mt]
-            a["finish"]["d"  ] = d
-            a["finish"]["id" ] = "OSut." + mt + ".%03d" % int(d * 1000)
+            a["finish"] = _Layer(_mats[mt], d, "OSut.%s.%03d" % (mt, d * 1000))
 
-    elif specs["type"] == "wall":
-        if specs["clad"] != "none":
+    elif typ == "wall":
+        if clad != "none":
             mt = "material"
             d  = 0.100
-            if specs["clad"] == "medium": mt = "brick"
-            if specs["clad"] == "heavy":  mt = "concrete"
-            if specs["clad"] == "light":   d = 0.015
-            a["clad"]["mat"] = mats()[mt]
-            a["clad"]["d"  ] = d
-            a["clad"]["id" ] = "OSut." + mt + ".%03d" % int(d * 1000)
+            if clad == "medium": mt = "brick"
+            if clad == "heavy":  mt = "concrete"
+            if clad == "light":   d = 0.015
+            a["clad"] = _Layer(_mats[mt], d, "OSut.%s.%03d" % (mt, d * 1000))
 
         mt = "drywall"
         d  = 0.100
-        if specs["frame"] == "medium": mt = "mineral"
-        if specs["frame"] == "heavy":  mt = "polyiso"
-        if specs["frame"] == "light":   d = 0.015
-        a["sheath"]["mat"] = mats()[mt]
-        a["sheath"]["d"  ] = d
-        a["sheath"]["id" ] = "OSut." + mt + ".%03d" % int(d * 1000)
+        if frame == "medium": mt = "mineral"
+        if frame == "heavy":  mt = "polyiso"
+        if frame == "light":   d = 0.015
+        a["sheath"] = _Layer(_mats[mt], d, "OSut.%s.%03d" % (mt, d * 1000))
 
         mt = "mineral"
         d  = 0.100
-        if specs["frame"] == "medium": mt = "cellulose"
-        if specs["frame"] == "heavy":  mt = "concrete"
-        if not u:                      mt = "material"
-        if specs["frame"] == "heavy":   d = 0.200
-        if not u:                       d = 0.015
-        a["compo"]["mat"] = mats()[mt]
-        a["compo"]["d"  ] = d
-        a["compo"]["id" ] = "OSut." + mt + ".%03d" % int(d * 1000)
-
-        if specs["finish"] != "none":
+        if frame == "medium": mt = "cellulose"
+        if frame == "heavy":  mt = "concrete"
+        if not u:             mt = "material"
+        if frame == "heavy":   d = 0.200
+        if not u:              d = 0.015
+        a["compo"] = _Layer(_mats[mt], d, "OSut.%s.%03d" % (mt, d * 1000))
+
+        if finish != "none":
             mt = "concrete"
             d  = 0.015
-            if specs["finish"] == "light":  mt = "drywall"
-            if specs["finish"] == "medium":  d = 0.100
-            if specs["finish"] == "heavy":   d = 0.200
-            a["finish"]["mat"] = mats()[mt]
-            a["finish"]["d"  ] = d
-            a["finish"]["id" ] = "OSut." + mt + ".%03d" % int(d * 1000)
-
-    elif specs["type"] == "roof":
-        if specs["clad"] != "none":
+            if finish == "light":  mt = "drywall"
+            if finish == "medium":  d = 0.100
+            if finish == "heavy":   d = 0.200
+            a["finish"] = _Layer(_mats[mt], d, "OSut.%s.%03d" % (mt, d * 1000))
+
+    elif typ == "roof":
+        if clad != "none":
             mt = "concrete"
             d  = 0.015
-            if specs["clad"] == "light": mt = "material"
-            if specs["clad"] == "medium": d = 0.100 # e.g. terrace
-            if specs["clad"] == "heavy":  d = 0.200 # e.g. parking garage
-            a["clad"]["mat"] = mats()[mt]
-            a["clad"]["d"  ] = d
-            a["clad"]["id" ] = "OSut." + mt + ".%03d" % int(d * 1000)
+            if clad == "light": mt = "material"
+            if clad == "medium": d = 0.100 # e.g. terrace
+            if clad == "heavy":  d = 0.200 # e.g. parking garage
+            a["clad"] = _Layer(_mats[mt], d, "OSut.%s.%03d" % (mt, d * 1000))
 
         mt = "mineral"
         d  = 0.100
-        if specs["frame"] == "medium": mt = "polyiso"
-        if specs["frame"] == "heavy":  mt = "cellulose"
-        if not u:                      mt = "material"
-        if not u:                       d = 0.015
-        a["compo"]["mat"] = mats()[mt]
-        a["compo"]["d"  ] = d
-        a["compo"]["id" ] = "OSut." + mt + ".%03d" % int(d * 1000)
-
-        if specs["finish"] != "none":
+        if frame == "medium": mt = "polyiso"
+        if frame == "heavy":  mt = "cellulose"
+        if not u:             mt = "material"
+        if not u:              d = 0.015
+        a["compo"] = _Layer(_mats[mt], d, "OSut.%s.%03d" % (mt, d * 1000))
+
+        if finish != "none":
             mt = "concrete"
             d  = 0.015
-            if specs["finish"] == "light":  mt = "drywall"
-            if specs["finish"] == "medium":  d = 0.100 # proxy for steel decking
-            if specs["finish"] == "heavy":   d = 0.200
-            a["finish"]["mat"] = mats()[mt]
-            a["finish"]["d"  ] = d
-            a["finish"]["id" ] = "OSut." + mt + ".%03d" % int(d * 1000)
-
-    elif specs["type"] == "floor":
-        if specs["clad"] != "none":
+            if finish == "light":  mt = "drywall"
+            if finish == "medium":  d = 0.100 # proxy for steel decking
+            if finish == "heavy":   d = 0.200
+            a["finish"] = _Layer(_mats[mt], d, "OSut.%s.%03d" % (mt, d * 1000))
+
+    elif typ == "floor":
+        if clad != "none":
             mt = "material"
             d  = 0.015
-            a["clad"]["mat"] = mats()[mt]
-            a["clad"]["d"  ] = d
-            a["clad"]["id" ] = "OSut." + mt + ".%03d" % int(d * 1000)
+            a["clad"] = _Layer(_mats[mt], d, "OSut.%s.%03d" % (mt, d * 1000))
 
         mt = "mineral"
         d  = 0.100
-        if specs["frame"] == "medium": mt = "polyiso"
-        if specs["frame"] == "heavy":  mt = "cellulose"
-        if not u:                      mt = "material"
-        if not u:                       d = 0.015
-        a["compo"]["mat"] = mats()[mt]
-        a["compo"]["d"  ] = d
-        a["compo"]["id" ] = "OSut." + mt + ".%03d" % int(d * 1000)
-
-        if specs["finish"] != "none":
+        if frame == "medium": mt = "polyiso"
+        if frame == "heavy":  mt = "cellulose"
+        if not u:             mt = "material"
+        if not u:              d = 0.015
+        a["compo"] = _Layer(_mats[mt], d, "OSut.%s.%03d" % (mt, d * 1000))
+
+        if finish != "none":
             mt = "concrete"
             d  = 0.015
-            if specs["finish"] == "light": mt = "material"
-            if specs["finish"] == "medium": d = 0.100
-            if specs["finish"] == "heavy":  d = 0.200
-            a["finish"]["mat"] = mats()[mt]
-            a["finish"]["d"  ] = d
-            a["finish"]["id" ] = "OSut." + mt + ".%03d" % int(d * 1000)
-
-    elif specs["type"] == "slab":
+            if finish == "light": mt = "material"
+            if finish == "medium": d = 0.100
+            if finish == "heavy":  d = 0.200
+            a["finish"] = _Layer(_mats[mt], d, "OSut.%s.%03d" % (mt, d * 1000))
+
+    elif typ == "slab":
         mt = "sand"
         d  = 0.100
-        a["clad"]["mat"] = mats()[mt]
-        a["clad"]["d"  ] = d
-        a["clad"]["id" ] = "OSut." + mt + ".%03d" % int(d * 1000)
+        a["clad"] = _Layer(_mats[mt], d, "OSut.%s.%03d" % (mt, d * 1000))
 
-        if specs["frame"] != "none":
+        if frame != "none":
             mt = "polyiso"
             d  = 0.025
-            a["sheath"]["mat"] = mats()[mt]
-            a["sheath"]["d"  ] = d
-            a["sheath"]["id" ] = "OSut." + mt + ".%03d" % int(d * 1000)
+            a["sheath"] = _Layer(_mats[mt], d, "OSut.%s.%03d" % (mt, d * 1000))
 
         mt = "concrete"
         d  = 0.100
-        if specs["frame"] == "heavy": d = 0.200
-        a["compo"]["mat"] = mats()[mt]
-        a["compo"]["d"  ] = d
-        a["compo"]["id" ] = "OSut." + mt + ".%03d" % int(d * 1000)
+        if frame == "heavy": d = 0.200
+        a["compo"] = _Layer(_mats[mt], d, "OSut.%s.%03d" % (mt, d * 1000))
 
-        if specs["finish"] != "none":
+        if finish != "none":
             mt = "material"
             d  = 0.015
-            a["finish"]["mat"] = mats()[mt]
-            a["finish"]["d"  ] = d
-            a["finish"]["id" ] = "OSut." + mt + ".%03d" % int(d * 1000)
+            a["finish"] = _Layer(_mats[mt], d, "OSut.%s.%03d" % (mt, d * 1000))
 
-    elif specs["type"] == "basement":
-        if specs["clad"] != "none":
+    elif typ == "basement":
+        if clad != "none":
             mt = "concrete"
             d  = 0.100
-            if specs["clad"] == "light": mt = "material"
-            if specs["clad"] == "light":  d = 0.015
-            a["clad"]["mat"] = mats[mt]
-            a["clad"]["d"  ] = d
-            a["clad"]["id" ] = "OSut." + mt + ".%03d" % int(d * 1000)
+            if clad == "light": mt = "material"
+            if clad == "light":  d = 0.015
+            a["clad"] = _Layer(_mats[mt], d, "OSut.%s.%03d" % (mt, d * 1000))
 
             mt = "polyiso"
             d  = 0.025
-            a["sheath"]["mat"] = mats()[mt]
-            a["sheath"]["d"  ] = d
-            a["sheath"]["id" ] = "OSut." + mt + ".%03d" % int(d * 1000)
+            a["sheath"] = _Layer(_mats[mt], d, "OSut.%s.%03d" % (mt, d * 1000))
 
             mt = "concrete"
             d  = 0.200
-            a["compo"]["mat"] = mats()[mt]
-            a["compo"]["d"  ] = d
-            a["compo"]["id" ] = "OSut." + mt + ".%03d" % int(d * 1000)
+            a["compo"] = _Layer(_mats[mt], d, "OSut.%s.%03d" % (mt, d * 1000))
         else:
             mt = "concrete"
             d  = 0.200
-            a["sheath"]["mat"] = mats()[mt]
-            a["sheath"]["d"  ] = d
-            a["sheath"]["id" ] = "OSut." + mt + ".%03d" % int(d * 1000)
+            a["sheath"] = _Layer(_mats[mt], d, "OSut.%s.%03d" % (mt, d * 1000))
 
-            if specs["finish"] != "none":
+            if finish != "none":
                 mt = "mineral"
                 d  = 0.075
-                a["compo"]["mat"] = mats()[mt]
-                a["compo"]["d"  ] = d
-                a["compo"]["id" ] = "OSut." + mt + ".%03d" % int(d * 1000)
+                a["compo"] = _Layer(_mats[mt], d,
+                                    "OSut.%s.%03d" % (mt, d * 1000))
 
                 mt = "drywall"
                 d  = 0.015
-                a["finish"]["mat"] = mats()[mt]
-                a["finish"]["d"  ] = d
-                a["finish"]["id" ] = "OSut." + mt + ".%03d" % int(d * 1000)
+                a["finish"] = _Layer(_mats[mt], d,
+                                     "OSut.%s.%03d" % (mt, d * 1000))
 
-    elif specs["type"] == "door":
+    elif typ == "door":
         mt = "door"
         d  = 0.045
-        a["compo"  ]["mat" ] = mats()[mt]
-        a["compo"  ]["d"   ] = d
-        a["compo"  ]["id"  ] = "OSut." + mt + ".%03d" % int(d * 1000)
-
-    elif specs["type"] == "window":
-        a["glazing"]["u"   ]  = u if u else uo()["window"]
-        a["glazing"]["shgc"]  = 0.450
-        if "shgc" in specs: a["glazing"]["shgc"] = specs["shgc"]
-        a["glazing"]["id"  ]  = "OSut.window"
-        a["glazing"]["id"  ] += ".U%.1f"  % a["glazing"]["u"]
-        a["glazing"]["id"  ] += ".SHGC%d" % (a["glazing"]["shgc"]*100)
-
-    elif specs["type"] == "skylight":
-        a["glazing"]["u"   ]  = u if u else uo()["skylight"]
-        a["glazing"]["shgc"]  = 0.450
-        if "shgc" in specs: a["glazing"]["shgc"] = specs["shgc"]
-        a["glazing"]["id"  ]  = "OSut.skylight"
-        a["glazing"]["id"  ] += ".U%.1f"  % a["glazing"]["u"]
-        a["glazing"]["id"  ] += ".SHGC%d" % (a["glazing"]["shgc"]*100)
+        a["compo"] = _Layer(_mats[mt], d, "OSut.%s.%03d" % (mt, d * 1000))
+
+    elif typ in ("window", "skylight"):
+        gu   = u if u else _uo[typ]
+        shgc = specs.get("shgc", 0.450)
+        a["glazing"] = dict(u=gu, shgc=shgc,
+                            id="OSut.%s.U%.1f.SHGC%d" % (typ, gu, shgc * 100))
 
     if a["glazing"]:
         layers = openstudio.model.FenestrationMaterialVector()
@@ -1160,24 +1159,20 @@ def genConstruction(model=None, specs=dict()):
         layers = openstudio.model.OpaqueMaterialVector()
 
         # Loop through each layer spec, and generate construction.
-        for i, l in a.items():
+        for l in a.values():
             if not l: continue
 
-            lyr = model.getStandardOpaqueMaterialByName(l["id"])
+            lyr = model.getStandardOpaqueMaterialByName(l.id)
 
             if lyr:
                 lyr = lyr.get()
             else:
                 lyr = openstudio.model.StandardOpaqueMaterial(model)
-                lyr.setName(l["id"])
-                lyr.setThickness(l["d"])
-                if "rgh" in l["mat"]: lyr.setRoughness(l["mat"]["rgh"])
-                if "k"   in l["mat"]: lyr.setConductivity(l["mat"]["k"])
-                if "rho" in l["mat"]: lyr.setDensity(l["mat"]["rho"])
-                if "cp"  in l["mat"]: lyr.setSpecificHeat(l["mat"]["cp" ])
-                if "thm" in l["mat"]: lyr.setThermalAbsorptance(l["mat"]["thm"])
-                if "sol" in l["mat"]: lyr.setSolarAbsorptance(l["mat"]["sol"])
-                if "vis" in l["mat"]: lyr.setVisibleAbsorptance(l["mat"]["vis"])
+                lyr.setName(l.id)
+                lyr.setThickness(l.d)
+
+                for k, v in l.mat.items():
+                    if k in _msets: _msets[k](lyr, v)
 
             layers.append(lyr)
 
@@ -1189,11 +1184,11 @@ def genConstruction(model=None, specs=dict()):
         ro = 1 / u - flm
 
         if ro > CN.RMIN:
-            if specs["type"] == "door": # 1x layer, adjust conductivity
+            if typ == "door": # 1x layer, adjust conductivity
                 layer = c.getLayer(0).to_StandardOpaqueMaterial()
 
                 if not layer:
-                    return oslg.invalid(id + " standard material?", mth, 0)
+                    return oslg.invalid(ide + " standard material?", mth, 0)
 
                 layer = layer.get()
                 k     = layer.thickness() / ro
@@ -1232,7 +1227,7 @@ def genShade(subs=None) -> bool:
     mth = "osut.genShade"
     cl  = openstudio.model.SubSurfaceVector
 
-    if int("".join(openstudio.openStudioVersion().split("."))) < 321:
+    if _osv < 321:
         return False
     if not isinstance(subs, cl):
         return oslg.mismatch("subs", subs, cl, mth, CN.DBG, False)
@@ -1380,22 +1375,25 @@ def genMass(sps=None, ratio=2.0) -> bool:
     df  = mdl.getInternalMassDefinitionByName(ide)
 
     if df:
-        df = df.get
+        df = df.get()
     else:
         df = openstudio.model.InternalMassDefinition(mdl)
         df.setName(ide)
         df.setConstruction(con)
         df.setSurfaceAreaperSpaceFloorArea(ratio)
 
+    im = openstudio.model.InternalMass # no bulk (vector) API in OpenStudio
+
     for sp in sps:
-        mass = openstudio.model.InternalMass(df)
+        mass = im(df)
         mass.setName("OSut.InternalMass.%s" % sp.nameString())
         mass.setSpace(sp)
 
     return True
 
 
-def holdsConstruction(cset=None, base=None, gr=False, ex=False, type="") -> bool:
+def holdsConstruction(cset=None, base=None, gr=False, ex=False, stype="",
+                      type=None) -> bool:
     """Validates whether a default construction set holds a base construction.
 
     Args:
@@ -1407,8 +1405,10 @@ def holdsConstruction(cset=None, base=None, gr=False, ex=False, type="") -> bool
             Whether ground-facing surface.
         ex (bool):
             Whether exterior-facing surface.
-        type (str):
+        stype (str):
             An OpenStudio surface (or sub surface) type (e.g. "Wall").
+        type (str):
+            Deprecated keyword alias of 'stype' (to be removed).
 
     Returns:
         bool: Whether default set holds construction.
@@ -1418,10 +1418,6 @@ def holdsConstruction(cset=None, base=None, gr=False, ex=False, type="") -> bool
     mth = "osut.holdsConstruction"
     cl1 = openstudio.model.DefaultConstructionSet
     cl2 = openstudio.model.ConstructionBase
-    t1  = openstudio.model.Surface.validSurfaceTypeValues()
-    t2  = openstudio.model.SubSurface.validSubSurfaceTypeValues()
-    t1  = [t.lower() for t in t1]
-    t2  = [t.lower() for t in t2]
     c   = None
 
     if not isinstance(cset, cl1):
@@ -1433,69 +1429,43 @@ def holdsConstruction(cset=None, base=None, gr=False, ex=False, type="") -> bool
     if not isinstance(ex, bool):
         return oslg.mismatch("exterior", ex, bool, mth, CN.DBG, False)
 
+    if type is not None:
+        oslg.log(CN.DBG, "'type' deprecated, use 'stype' (%s)" % mth)
+        stype = type
+
     try:
-        type = str(type)
+        stype = str(stype)
     except:
-        return oslg.mismatch("surface type", type, str, mth, CN.DBG, False)
+        return oslg.mismatch("surface type", stype, str, mth, CN.DBG, False)
+
+    stype = stype.lower()
 
-    type = type.lower()
+    if stype in _surfs:
+        get = _surfs[stype]
 
-    if type in t1:
         if gr:
-            if cset.defaultGroundContactSurfaceConstructions():
-                c = cset.defaultGroundContactSurfaceConstructions().get()
+            c = cset.defaultGroundContactSurfaceConstructions()
         elif ex:
-            if cset.defaultExteriorSurfaceConstructions():
-                c = cset.defaultExteriorSurfaceConstructions().get()
+            c = cset.defaultExteriorSurfaceConstructions()
         else:
-            if cset.defaultInteriorSurfaceConstructions():
-                c = cset.defaultInteriorSurfaceConstructions().get()
-    elif type in t2:
-        if gr:
-            return False
+            c = cset.defaultInteriorSurfaceConstructions()
+    elif stype in _subs:
+        if gr: return False
+
+        get = _subs[stype]
+
         if ex:
-            if cset.defaultExteriorSubSurfaceConstructions():
-                c = cset.defaultExteriorSubSurfaceConstructions().get()
+            c = cset.defaultExteriorSubSurfaceConstructions()
         else:
-            if cset.defaultInteriorSubSurfaceConstructions():
-                c = cset.defaultInteriorSubSurfaceConstructions().get()
+            c = cset.defaultInteriorSubSurfaceConstructions()
     else:
         return oslg.invalid("surface type", mth, 5, CN.DBG, False)
 
-    if c is None: return False
-
-    if type in t1:
-        if type == "roofceiling":
-            if c.roofCeilingConstruction():
-                if c.roofCeilingConstruction().get() == base: return True
-        elif type == "floor":
-            if c.floorConstruction():
-                if c.floorConstruction().get() == base: return True
-        else: # "wall"
-            if c.wallConstruction():
-                if c.wallConstruction().get() == base: return True
-    else: # t2
-        if type == "tubulardaylightdiffuser":
-            if c.tubularDaylightDiffuserConstruction():
-                if c.tubularDaylightDiffuserConstruction() == base: return True
-        elif type == "tubulardaylightdome":
-            if c.tubularDaylightDomeConstruction():
-                if c.tubularDaylightDomeConstruction().get() == base: return True
-        elif type == "skylight":
-            if c.overheadDoorConstruction():
-                if c.overheadDoorConstruction().get() == base: return True
-        elif type == "glassdoor":
-            if c.glassDoorConstruction():
-                if c.glassDoorConstruction().get() == base: return True
-        elif type == "door":
-            if c.doorConstruction():
-                if c.doorConstruction().get() == base: return True
-        elif type == "operablewindow":
-            if c.operableWindowConstruction():
-                if c.operableWindowConstruction().get() == base: return True
-        else: # "fixedwindow"
-            if c.fixedWindowConstruction():
-                if c.fixedWindowConstruction().get() == base: return True
+    if not c: return False
+
+    cc = get(c.get())
+
+    if cc and cc.get() == base: return True
 
     return False
 
@@ -1520,80 +1490,100 @@ def defaultConstructionSet(s=None):
     if not s.isConstructionDefaulted():
         oslg.log(CN.WRN, "construction not defaulted (%s)" % mth)
         return None
-    if not s.construction():
+
+    base  = s.construction()
+    space = s.space()
+
+    if not base:
         return oslg.empty("construction", mth, CN.WRN)
-    if not s.space():
+    if not space:
         return oslg.empty("space", mth, CN.WRN)
 
     mdl   = s.model()
-    base  = s.construction().get()
-    space = s.space().get()
-    type  = s.surfaceType()
+    base  = base.get()
+    space = space.get()
+    stype = s.surfaceType()
     bnd   = s.outsideBoundaryCondition().lower()
 
     ground   = True if s.isGroundSurface() else False
     exterior = True if bnd == "outdoors"   else False
-    adjacent = None
+    adjacent = s.adjacentSurface()
     aspace   = None
     typ      = None
 
-    if s.adjacentSurface():
-        adjacent = s.adjacentSurface().get()
-        typ = adjacent.surfaceType()
+    if adjacent:
+        adjacent = adjacent.get()
+        typ      = adjacent.surfaceType()
+        aspace   = adjacent.space()
+        aspace   = aspace.get() if aspace else None
 
-        if adjacent.space():
-            aspace = adjacent.space().get()
+    cset = space.defaultConstructionSet()
 
-    if space.defaultConstructionSet():
-        set = space.defaultConstructionSet().get()
+    if cset:
+        cset = cset.get()
 
-        if holdsConstruction(set, base, ground, exterior, type): return set
+        if holdsConstruction(cset, base, ground, exterior, stype):
+            return cset
     elif aspace:
-        if aspace.defaultConstructionSet():
-            set = aspace.defaultConstructionSet().get()
+        cset = aspace.defaultConstructionSet()
+
+        if cset:
+            cset = cset.get()
 
-            if holdsConstruction(set, base, ground, exterior, typ): return set
+            if holdsConstruction(cset, base, ground, exterior, typ):
+                return cset
 
-    if space.spaceType():
-        spacetype = space.spaceType().get()
+    spacetype = space.spaceType()
 
-        if spacetype.defaultConstructionSet():
-            set = spacetype.defaultConstructionSet().get()
+    if spacetype:
+        cset = spacetype.get().defaultConstructionSet()
 
-            if holdsConstruction(set, base, ground, exterior, type): return set
+        if cset:
+            cset = cset.get()
 
-    if aspace and aspace.spaceType():
-        spacetype = aspace.spaceType().get()
+            if holdsConstruction(cset, base, ground, exterior, stype):
+                return cset
 
-        if spacetype.defaultConstructionSet():
-            set = spacetype.defaultConstructionSet().get()
+    spacetype = aspace.spaceType() if aspace else None
 
-            if holdsConstruction(set, base, ground, exterior, typ): return set
+    if spacetype:
+        cset = spacetype.get().defaultConstructionSet()
 
-    if space.buildingStory():
-        story = space.buildingStory().get()
+        if cset:
+            cset = cset.get()
 
-        if story.defaultConstructionSet():
-            set = story.defaultConstructionSet().get()
+            if holdsConstruction(cset, base, ground, exterior, typ):
+                return cset
 
-            if holdsConstruction(set, base, ground, exterior, type): return set
+    story = space.buildingStory()
 
-    if aspace and aspace.buildingStory():
-        story = aspace.buildingStory().get()
+    if story:
+        cset = story.get().defaultConstructionSet()
 
-        if story.defaultConstructionSet():
-            set = story.defaultConstructionSet().get()
+        if cset:
+            cset = cset.get()
 
-            if holdsConstruction(set, base, ground, exterior, typ):
-                return set
+            if holdsConstruction(cset, base, ground, exterior, stype):
+                return cset
 
-    building = mdl.getBuilding()
+    story = aspace.buildingStory() if aspace else None
 
-    if building.defaultConstructionSet():
-        set = building.defaultConstructionSet().get()
+    if story:
+        cset = story.get().defaultConstructionSet()
 
-        if holdsConstruction(set, base, ground, exterior, type):
-            return set
+        if cset:
+            cset = cset.get()
+
+            if holdsConstruction(cset, base, ground, exterior, typ):
+                return cset
+
+    cset = mdl.getBuilding().defaultConstructionSet()
+
+    if cset:
+        cset = cset.get()
+
+        if holdsConstruction(cset, base, ground, exterior, stype):
+            return cset
 
     return None
 
@@ -1668,9 +1658,9 @@ def isFenestrated(s=None) -> bool:
     #   "Skylight"                 : fenestration
     #   "TubularDaylightDome"      : fenestration
     #   "TubularDaylightDiffuser"  : fenestration
-    if s.subSurfaceType().lower() in ["door", "overheaddoor"]: return False
-
-    return True
+    #
+    # OpenStudio stores types as set (e.g. "overheaddoor"), hence 'lower()'.
+    return s.subSurfaceType().lower() not in ("door", "overheaddoor")
 
 # ---- --- --- --- --- --- --- --- --- --- --- --- --- --- --- --- --- ---- #
 # ---- --- --- --- --- --- --- --- --- --- --- --- --- --- --- --- --- ---- #
@@ -1826,7 +1816,7 @@ def hasAirLoopsHVAC(model=None) -> bool:
 
     for zone in model.getThermalZones():
         if zone.canBePlenum(): continue
-        if zone.airLoopHVACs() or zone.isPlenum(): return True
+        if zone.isPlenum() or zone.airLoopHVACs(): return True # cheap first
 
     return False
 
@@ -1856,22 +1846,17 @@ def scheduleRulesetMinMax(sched=None) -> dict:
     if not isinstance(sched, cl):
         return oslg.mismatch("sched", sched, cl, mth, CN.DBG, res)
 
-    values = list(sched.defaultDaySchedule().values())
+    days = [rule.daySchedule() for rule in sched.scheduleRules()]
+    days.append(sched.defaultDaySchedule())
 
-    for rule in sched.scheduleRules(): values += rule.daySchedule().values()
+    for day in days:
+        values = day.values()
+        if not values: continue
 
-    res["min"] = min(values)
-    res["max"] = max(values)
-
-    try:
-        res["min"] = float(res["min"])
-    except:
-        res["min"] = None
-
-    try:
-        res["max"] = float(res["max"])
-    except:
-        res["max"] = None
+        mn = min(values)
+        mx = max(values)
+        if res["min"] is None or mn < res["min"]: res["min"] = mn
+        if res["max"] is None or mx > res["max"]: res["max"] = mx
 
     return res
 
@@ -1901,13 +1886,7 @@ def scheduleConstantMinMax(sched=None) -> dict:
     if not isinstance(sched, cl):
         return oslg.mismatch("sched", sched, cl, mth, CN.DBG, res)
 
-    try:
-        value = float(sched.value())
-    except:
-        return None
-
-    res["min"] = value
-    res["max"] = value
+    res["min"] = res["max"] = sched.value()
 
     return res
 
@@ -1941,11 +1920,12 @@ def scheduleCompactMinMax(sched=None) -> dict:
 
     for eg in sched.extensibleGroups():
         if "until" in prev:
-            if eg.getDouble(0): vals.append(eg.getDouble(0).get())
+            val = eg.getDouble(0)
+            if val: vals.append(val.get())
 
-        str  = eg.getString(0)
+        txt = eg.getString(0)
 
-        if str: prev = str.get().lower()
+        if txt: prev = txt.get().lower()
 
     if not vals:
         return oslg.empty("compact sched values", mth, CN.WRN, res)
@@ -1953,16 +1933,6 @@ def scheduleCompactMinMax(sched=None) -> dict:
     res["min"] = min(vals)
     res["max"] = max(vals)
 
-    try:
-        res["min"] = float(res["min"])
-    except:
-        res["min"] = None
-
-    try:
-        res["max"] = float(res["max"])
-    except:
-        res["max"] = None
-
     return res
 
 
@@ -1978,39 +1948,76 @@ def scheduleIntervalMinMax(sched=None) -> dict:
         - "min" (float): min temperature. (None if invalid inputs - see logs).
         - "max" (float): max temperature. (None if invalid inputs - see logs).
     """
-    mth  = "osut.scheduleIntervalMinMax"
-    cl   = openstudio.model.ScheduleInterval
-    vals = []
-    res  = dict(min=None, max=None)
+    mth = "osut.scheduleIntervalMinMax"
+    cl  = openstudio.model.ScheduleInterval
+    res = dict(min=None, max=None)
 
     if not isinstance(sched, cl):
         return oslg.mismatch("sched", sched, cl, mth, CN.DBG, res)
 
+    # Time series MIN/MAX reductions are left to OpenStudio (C++).
     values = sched.timeSeries().values()
 
-    for i in range(len(values)):
-        try:
-            value = float(values[i])
-            vals.append(value)
-        except:
-            oslg.invalid("numerical at %d" % i, mth, 1, CN.ERR)
+    if not values.size(): return res
 
-    if not vals: return res
+    res["min"] = openstudio.minimum(values)
+    res["max"] = openstudio.maximum(values)
 
-    res["min"] = min(vals)
-    res["max"] = max(vals)
+    return res
 
-    try:
-        res["min"] = float(res["min"])
-    except:
-        res["min"] = None
 
-    try:
-        res["max"] = float(res["max"])
-    except:
-        res["max"] = None
+# Schedule downcasts, paired with their MIN/MAX getters.
+_sch    = openstudio.model.Schedule
+_schedz = ((_sch.to_ScheduleRuleset,  scheduleRulesetMinMax ),
+           (_sch.to_ScheduleConstant, scheduleConstantMinMax),
+           (_sch.to_ScheduleCompact,  scheduleCompactMinMax ),
+           (_sch.to_ScheduleInterval, scheduleIntervalMinMax))
 
-    return res
+
+def _scheduledSetpoint(sched=None, heat=True):
+    """Returns a temperature schedule's MAX heating (or MIN cooling) setpoint.
+
+    Args:
+        sched (openstudio.model.Schedule):
+            A temperature setpoint schedule.
+        heat (bool):
+            Whether MAX heating (or else MIN cooling) setpoint.
+
+    Returns:
+        float: Setpoint [°C] (None if undetermined).
+    """
+    key  = "max" if heat else "min"
+    ext  = max   if heat else min
+    vals = []
+
+    for to, minmax in _schedz:
+        sch = to(sched)
+        if not sch: continue
+
+        sch = sch.get()
+        val = minmax(sch)[key]
+        if val: vals.append(val)
+
+        if isinstance(sch, openstudio.model.ScheduleRuleset):
+            if heat:
+                vals += sch.winterDesignDaySchedule().values()
+            else:
+                vals += sch.summerDesignDaySchedule().values()
+
+        return ext(vals) if vals else None
+
+    sch = sched.to_ScheduleYear()
+
+    if sch:
+        for week in sch.get().getScheduleWeeks():
+            if heat:
+                dd = week.winterDesignDaySchedule()
+            else:
+                dd = week.summerDesignDaySchedule()
+
+            if dd: vals += dd.get().values()
+
+    return ext(vals) if vals else None
 
 
 def maxHeatScheduledSetpoint(zone=None) -> dict:
@@ -2041,6 +2048,25 @@ def maxHeatScheduledSetpoint(zone=None) -> dict:
     if not isinstance(zone, cl):
         return oslg.mismatch("zone", zone, cl, mth, CN.DBG, res)
 
+    # Thermostat setpoints, if any, prevail over radiant systems.
+    tstat = zone.thermostat()
+
+    if tstat:
+        tstat = tstat.get()
+        dual  = tstat.to_ThermostatSetpointDualSetpoint()
+
+        if not dual:
+            dual = tstat.to_ZoneControlThermostatStagedDualSetpoint()
+
+        if dual:
+            sched = dual.get().heatingSetpointTemperatureSchedule()
+
+            if sched:
+                res["dual"] = True
+                res["spt" ] = _scheduledSetpoint(sched.get(), True)
+
+        return res
+
     # Zone radiant heating? Get schedule from radiant system.
     for equip in zone.equipment():
         sched = None
@@ -2064,7 +2090,7 @@ def maxHeatScheduledSetpoint(zone=None) -> dict:
                 coil = coil.to_CoilHeatingLowTempRadiantConstFlow().get()
 
                 if coil.heatingHighControlTemperatureSchedule():
-                    sched = c.heatingHighControlTemperatureSchedule().get()
+                    sched = coil.heatingHighControlTemperatureSchedule().get()
 
         if equip.to_ZoneHVACLowTempRadiantVarFlow():
             equip = equip.to_ZoneHVACLowTempRadiantVarFlow().get()
@@ -2078,109 +2104,11 @@ def maxHeatScheduledSetpoint(zone=None) -> dict:
 
         if sched is None: continue
 
-        if sched.to_ScheduleRuleset():
-            sched = sched.to_ScheduleRuleset().get()
-            maximum = scheduleRulesetMinMax(sched)["max"]
-
-            if maximum:
-                if res["spt"] is None or res["spt"] < maximum:
-                    res["spt"] = maximum
-
-            dd = sched.winterDesignDaySchedule()
-
-            if dd.values():
-                if res["spt"] is None or res["spt"] < max(dd.values()):
-                    res["spt"] = max(dd.values())
+        spt = _scheduledSetpoint(sched, True)
 
-        if sched.to_ScheduleConstant():
-            sched = sched.to_ScheduleConstant().get()
-            maximum = scheduleConstantMinMax(sched)["max"]
+        if spt is not None:
+            if res["spt"] is None or res["spt"] < spt: res["spt"] = spt
 
-            if maximum:
-                if res["spt"] is None or res["spt"] < maximum:
-                    res["spt"] = maximum
-
-        if sched.to_ScheduleCompact():
-            sched = sched.to_ScheduleCompact().get()
-            maximum = scheduleCompactMinMax(sched)["max"]
-
-            if maximum:
-                if res["spt"] is None or res["spt"] < maximum:
-                    res["spt"] = maximum
-
-        if sched.to_ScheduleInterval():
-            sched = sched.to_ScheduleInterval().get()
-            maximum = scheduleIntervalMinMax(sched)["max"]
-
-            if maximum:
-                if res["spt"] is None or res["spt"] < maximum:
-                    res["spt"] = maximum
-
-    if not zone.thermostat(): return res
-
-    tstat = zone.thermostat().get()
-    res["spt"] = None
-
-    if (tstat.to_ThermostatSetpointDualSetpoint() or
-        tstat.to_ZoneControlThermostatStagedDualSetpoint()):
-
-        if tstat.to_ThermostatSetpointDualSetpoint():
-            tstat = tstat.to_ThermostatSetpointDualSetpoint().get()
-        else:
-            tstat = tstat.to_ZoneControlThermostatStagedDualSetpoint().get()
-
-        if tstat.heatingSetpointTemperatureSchedule():
-            res["dual"] = True
-            sched = tstat.heatingSetpointTemperatureSchedule().get()
-
-            if sched.to_ScheduleRuleset():
-                sched = sched.to_ScheduleRuleset().get()
-                maximum = scheduleRulesetMinMax(sched)["max"]
-
-                if maximum:
-                    if res["spt"] is None or res["spt"] < maximum:
-                        res["spt"] = maximum
-
-                dd = sched.winterDesignDaySchedule()
-
-                if dd.values():
-                    if res["spt"] is None or res["spt"] < max(dd.values()):
-                        res["spt"] = max(dd.values())
-
-            if sched.to_ScheduleConstant():
-                sched = sched.to_ScheduleConstant().get()
-                maximum = scheduleConstantMinMax(sched)["max"]
-
-                if maximum:
-                    if res["spt"] is None or res["spt"] < maximum:
-                        res["spt"] = maximum
-
-            if sched.to_ScheduleCompact():
-                sched = sched.to_ScheduleCompact().get()
-                maximum = scheduleCompactMinMax(sched)["max"]
-
-                if maximum:
-                    if res["spt"] is None or res["spt"] < maximum:
-                        res["spt"] = maximum
-
-            if sched.to_ScheduleInterval():
-                sched = sched.to_ScheduleInterval().get()
-                maximum = scheduleIntervalMinMax(sched)["max"]
-
-                if maximum:
-                    if res["spt"] is None or res["spt"] < maximum:
-                        res["spt"] = maximum
-
-            if sched.to_ScheduleYear():
-                sched = sched.to_ScheduleYear().get()
-
-                for week in sched.getScheduleWeeks():
-                    if not week.winterDesignDaySchedule():
-                        dd = week.winterDesignDaySchedule().get()
-
-                        if dd.values():
-                            if res["spt"] is None or res["spt"] < max(dd.values()):
-                                res["spt"] = max(dd.values())
     return res
 
 
@@ -2232,6 +2160,25 @@ def minCoolScheduledSetpoint(zone=None):
     if not isinstance(zone, cl):
         return oslg.mismatch("zone", zone, cl, mth, CN.DBG, res)
 
+    # Thermostat setpoints, if any, prevail over radiant systems.
+    tstat = zone.thermostat()
+
+    if tstat:
+        tstat = tstat.get()
+        dual  = tstat.to_ThermostatSetpointDualSetpoint()
+
+        if not dual:
+            dual = tstat.to_ZoneControlThermostatStagedDualSetpoint()
+
+        if dual:
+            sched = dual.get().coolingSetpointTemperatureSchedule()
+
+            if sched:
+                res["dual"] = True
+                res["spt" ] = _scheduledSetpoint(sched.get(), False)
+
+        return res
+
     # Zone radiant cooling? Get schedule from radiant system.
     for equip in zone.equipment():
         sched = None
@@ -2258,110 +2205,10 @@ def minCoolScheduledSetpoint(zone=None):
 
         if sched is None: continue
 
-        if sched.to_ScheduleRuleset():
-            sched = sched.to_ScheduleRuleset().get()
-            minimum = scheduleRulesetMinMax(sched)["min"]
-
-            if minimum:
-                if res["spt"] is None or res["spt"] > minimum:
-                    res["spt"] = minimum
-
-            dd = sched.summerDesignDaySchedule()
-
-            if dd.values():
-                if res["spt"] is None or res["spt"] > min(dd.values()):
-                    res["spt"] = min(dd.values())
+        spt = _scheduledSetpoint(sched, False)
 
-        if sched.to_ScheduleConstant():
-            sched = sched.to_ScheduleConstant().get()
-            minimum = scheduleConstantMinMax(sched)["min"]
-
-            if minimum:
-                if res["spt"] is None or res["spt"] > minimum:
-                    res["spt"] = minimum
-
-        if sched.to_ScheduleCompact():
-            sched = sched.to_ScheduleCompact().get()
-            minimum = scheduleCompactMinMax(sched)["min"]
-
-            if minimum:
-                if res["spt"] is None or res["spt"] > minimum:
-                    res["spt"] = minimum
-
-        if sched.to_ScheduleInterval():
-            sched = sched.to_ScheduleInterval().get()
-            minimum = scheduleIntervalMinMax(sched)["min"]
-
-            if minimum:
-                if res["spt"] is None or res["spt"] > minimum:
-                    res["spt"] = minimum
-
-    if not zone.thermostat(): return res
-
-    tstat     = zone.thermostat().get()
-    res["spt"] = None
-
-    if (tstat.to_ThermostatSetpointDualSetpoint() or
-        tstat.to_ZoneControlThermostatStagedDualSetpoint()):
-
-        if tstat.to_ThermostatSetpointDualSetpoint():
-            tstat = tstat.to_ThermostatSetpointDualSetpoint().get()
-        else:
-            tstat = tstat.to_ZoneControlThermostatStagedDualSetpoint().get()
-
-        if tstat.coolingSetpointTemperatureSchedule():
-            res["dual"] = True
-            sched = tstat.coolingSetpointTemperatureSchedule().get()
-
-            if sched.to_ScheduleRuleset():
-                sched = sched.to_ScheduleRuleset().get()
-
-                minimum = scheduleRulesetMinMax(sched)["min"]
-
-                if minimum:
-                    if res["spt"] is None or res["spt"] > minimum:
-                        res["spt"] = minimum
-
-                dd = sched.summerDesignDaySchedule()
-
-                if dd.values():
-                    if res["spt"] is None or res["spt"] > min(dd.values()):
-                        res["spt"] = min(dd.values())
-
-            if sched.to_ScheduleConstant():
-                sched = sched.to_ScheduleConstant().get()
-                minimum = scheduleConstantMinMax(sched)["min"]
-
-                if minimum:
-                    if res["spt"] is None or res["spt"] > minimum:
-                        res["spt"] = minimum
-
-            if sched.to_ScheduleCompact():
-                sched = sched.to_ScheduleCompact().get()
-                minimum = scheduleCompactMinMax(sched)["min"]
-
-                if minimum:
-                    if res["spt"] is None or res["spt"] > minimum:
-                        res["spt"] = minimum
-
-            if sched.to_ScheduleInterval():
-                sched = sched.to_ScheduleInterval().get()
-                minimum = scheduleIntervalMinMax(sched)["min"]
-
-                if minimum:
-                    if res["spt"] is None or res["spt"] > minimum:
-                        res["spt"] = minimum
-
-            if sched.to_ScheduleYear():
-                sched = sched.to_ScheduleYear().get()
-
-                for week in sched.getScheduleWeeks():
-                    if not week.summerDesignDaySchedule():
-                        dd = week.summerDesignDaySchedule().get()
-
-                        if dd.values():
-                            if res["spt"] is None or res["spt"] < min(dd.values()):
-                                res["spt"] = min(dd.values())
+        if spt is not None:
+            if res["spt"] is None or res["spt"] > spt: res["spt"] = spt
 
     return res
 
@@ -2543,6 +2390,9 @@ def arePlenums(spaces=None):
     #   - OSut's isUnconditioned == FALSE
     mth = "osut.arePlenums"
     cl  = openstudio.model.Space
+    mdl = None # model-wide HVAC & setpoint checks, fetched once per model
+    air = None
+    spt = None
 
     if isinstance(spaces, cl):
         spaces = [spaces]
@@ -2556,6 +2406,11 @@ def arePlenums(spaces=None):
         if space.partofTotalFloorArea(): return False
         if areVestibules(space): return False
 
+        if mdl is None or space.model() != mdl:
+            mdl = space.model()
+            air = None
+            spt = None
+
         # CASE A: "plenum" spaceType.
         if space.spaceType():
             type = space.spaceType().get()
@@ -2566,15 +2421,19 @@ def arePlenums(spaces=None):
                 if "plenum" in type: continue
 
         # CASE B: "isPlenum" is TRUE if airloops.
-        if hasAirLoopsHVAC(space.model()):
+        if air is None: air = hasAirLoopsHVAC(mdl)
+
+        if air:
             if space.isPlenum(): continue
 
         # CASE C: zone holds an 'inactive' thermostat.
-        zone   = space.thermalZone()
-        heated = hasHeatingTemperatureSetpoints(space.model())
-        cooled = hasCoolingTemperatureSetpoints(space.model())
+        if spt is None:
+            spt = (hasHeatingTemperatureSetpoints(mdl) or
+                   hasCoolingTemperatureSetpoints(mdl))
 
-        if heated or cooled:
+        zone = space.thermalZone()
+
+        if spt:
             if zone:
                 zone = zone.get()
                 heat = maxHeatScheduledSetpoint(zone)
@@ -4663,8 +4522,10 @@ def cast(p1=None, p2=None, ray=None) -> openstudio.Point3dVector:
     n  = pl.outwardNormal()
     if abs(n.dot(ray)) < CN.TOL: return face
 
+    d = n.dot(ray.reverseVector())
+
     for pt in p1:
-        length = n.dot(pt - p0) / n.dot(ray.reverseVector())
+        length = n.dot(pt - p0) / d
         face.append(pt + scalar(ray, length))
 
     return face
@@ -4687,7 +4548,7 @@ def offset(p1=None, w=0, v=0) -> openstudio.Point3dVector:
 
     """
     mth = "osut.offset"
-    vs  = int("".join(openstudio.openStudioVersion().split(".")))
+    vs  = _osv
     pts = poly(p1, True, True, False, True, "cw")
 
     if len(pts) < 3 or len(pts) > 4:
@@ -5554,6 +5415,38 @@ def alignedHeight(pts=None, force=False) -> float:
     return max(ys) - min(ys)
 
 
+def _alignedSize(pts=None) -> tuple:
+    """Returns 'width' & 'height' of 3D points, once (force) realigned.
+
+    Args:
+        pts (openstudio.Point3dVector):
+            A set of OpenStudio 3D points.
+
+    Returns:
+        tuple: Width (along X-axis) & height (along Y-axis), once realigned.
+        (0, 0): If invalid inputs (see 'alignedWidth' & 'alignedHeight').
+    """
+    pts = poly(pts, False, True, True, True)
+    if len(pts) < 2: return 0, 0
+
+    pts = realignedFace(pts, True)["set"]
+    if len(pts) < 2: return 0, 0
+
+    pt   = pts[0]
+    minX = maxX = pt.x()
+    minY = maxY = pt.y()
+
+    for pt in pts:
+        x = pt.x()
+        y = pt.y()
+        if x < minX: minX = x
+        if x > maxX: maxX = x
+        if y < minY: minY = y
+        if y > maxY: maxY = y
+
+    return maxX - minX, maxY - minY
+
+
 def spaceHeight(space=None) -> float:
     """Fetch a space's full height.
 
@@ -5755,8 +5648,10 @@ def genAnchors(s=None, sset=[], tag="box") -> int:
             t0   = st["t0" ] # occupied space site transformation
             t    = st["t"  ] # initial alignment transformation of roof surface
             o    = st["out"]
-            tpts = t0.inverse() * (ti * (t * (o["r"] * (o["t"] * o["set"]))))
-            tpts = cast(tpts, pts, ray)
+
+            # Compose transformations first, then apply once to points.
+            tt   = t0.inverse() * ti * t * o["r"] * o["t"]
+            tpts = cast(tt * o["set"], pts, ray)
 
             st[tag] = tpts
         else:
@@ -5913,17 +5808,30 @@ def genExtendedVertices(s=None, sset=[], tag="vtx") -> openstudio.Point3dVector:
         if not isinstance(ld[ids], cl):
             return oslg.mismatch("%s point" % str2, st["ld"][ids], cl, mth, CN.DBG, a)
 
+    # Collect valid subset leader line anchors (XYZ coordinates) & vertices,
+    # once. Anchors are then matched to polygon vertices as in 'areSame'.
+    lds = []
+
+    for st in sset:
+        if "void" in st and st["void"]: continue
+
+        ld = st["ld"][ids]
+        lds.append((ld.x(), ld.y(), ld.z(), list(st[tag])))
+
     # Re-sequence polygon vertices.
     for pt in pts:
         v.append(pt)
+        x = pt.x()
+        y = pt.y()
+        z = pt.z()
 
         # Loop through each valid subset; concatenate circumscribing vertices.
-        for st in sset:
-            if "void" in st and st["void"]: continue
-            if not areSame(st["ld"][ids], pt): continue
-            if tag not in st: continue
+        for lx, ly, lz, vtx in lds:
+            if abs(lx - x) > CN.TOL: continue
+            if abs(ly - y) > CN.TOL: continue
+            if abs(lz - z) > CN.TOL: continue
 
-            v += list(st[tag])
+            v += vtx
             v.append(pt)
 
     return p3Dv(v)
@@ -6245,7 +6153,7 @@ def facets(spaces=[], boundary="all", type="all", sides=[]) -> list:
     # Filter sides. If 'sides' is initially empty, return all surfaces of
     # matching type and outside boundary condition.
     if sides:
-        sides = [side for side in sides if side in sidz()]
+        sides = [side for side in sides if side in _sidz]
 
         if not sides: return []
 
@@ -6583,7 +6491,7 @@ def addSubs(s=None, subs=[], clear=False, bound=False, realign=False, bfr=0.005)
     cl1 = openstudio.model.Surface
     cl2 = openstudio.model.WindowPropertyFrameAndDivider
     cl3 = openstudio.model.ConstructionBase
-    v   = int("".join(openstudio.openStudioVersion().split(".")))
+    v   = _osv
     mn  = 0.050 # minimum ratio value ( 5%)
     mx  = 0.950 # maximum ratio value (95%)
     if isinstance(subs, dict): subs = [subs]
@@ -7170,7 +7078,6 @@ def addSubs(s=None, subs=[], clear=False, bound=False, realign=False, bfr=0.005)
         # Generate sub(s).
         for i in range(sub["count"]):
             name = "%s:%d" % (ide, i)
-            fr   = sub["frame"].frameWidth() if sub["frame"] else 0
             vec  = openstudio.Point3dVector()
             vec.append(openstudio.Point3d(pos,              sub["head"], 0))
             vec.append(openstudio.Point3d(pos,              sub["sill"], 0))
@@ -7179,7 +7086,7 @@ def addSubs(s=None, subs=[], clear=False, bound=False, realign=False, bfr=0.005)
             vec = t * (s00["r"] * (s00["t"] * vec)) if s00 else t * vec
 
             # Log/skip if conflict between individual sub and base surface.
-            vc = offset(vec, fr, 300) if fr > 0 else p3Dv(vec)
+            vc = offset(vec, frame, 300) if frame > 0 else p3Dv(vec)
 
             if not fits(vc, s):
                 m = "Skip '%s': won't fit in '%s' (%s)" % (name, nom, mth)
@@ -7274,8 +7181,20 @@ def grossRoofArea(spaces=[]) -> float:
 
             rfs[ide] = dict(m2=roof.grossArea(), m=space.multiplier())
 
-    # Roof surfaces of unoccupied, conditioned spaces above (e.g. plenums)?
+    # Roof surfaces of unoccupied spaces above, in a single pass over ceilings:
+    #   - conditioned (e.g. plenums): all roof surfaces
+    #   - unconditioned (e.g. attics): roof surfaces overlapping ceilings
+    #
+    # @todo: recursive call for stacked spaces as atria (via AirBoundaries).
+    plnms = {} # plenum roofs
+    attcs = {} # attic roofs
+    uncnd = {} # memoized 'isUnconditioned', for each space above
+
     for space in spaces:
+        # When taking overlaps into account, target spaces often do not share
+        # the same local transformation as the space(s) above.
+        t0 = transforms(space)["t"]
+
         for ceiling in facets(space, "Surface", "RoofCeiling"):
             floor = ceiling.adjacentSurface()
             if not floor: continue
@@ -7285,42 +7204,30 @@ def grossRoofArea(spaces=[]) -> float:
 
             other = other.get()
             if other.partofTotalFloorArea(): continue
-            if isUnconditioned(other): continue
 
-            for roof in facets(other, "Outdoors", "RoofCeiling"):
-                ide = roof.nameString()
-                if ide in rfs: continue
-                if not isRoof(roof): continue
+            ido = other.nameString()
+            mo  = other.multiplier()
 
-                rfs[ide] = dict(m2=roof.grossArea(), m=other.multiplier())
+            if ido not in uncnd: uncnd[ido] = isUnconditioned(other)
 
-    # Roof surfaces of unoccupied, unconditioned spaces above (e.g. attics)?
-    # @todo: recursive call for stacked spaces as atria (via AirBoundaries).
-    for space in spaces:
-        # When taking overlaps into account, target spaces often do not share
-        # the same local transformation as the space(s) above.
-        t0 = transforms(space)
-        if t0["t"] is None: continue
+            if not uncnd[ido]:
+                for roof in facets(other, "Outdoors", "RoofCeiling"):
+                    ide = roof.nameString()
+                    if ide in rfs: continue
+                    if ide in plnms: continue
+                    if not isRoof(roof): continue
 
-        t0 = t0["t"]
+                    plnms[ide] = dict(m2=roof.grossArea(), m=mo)
 
-        for ceiling in facets(space, "Surface", "RoofCeiling"):
-            cv0 = t0 * ceiling.vertices()
-
-            floor = ceiling.adjacentSurface()
-            if not floor: continue
-
-            other = floor.get().space()
-            if not other: continue
+                continue
 
-            other = other.get()
-            if other.partofTotalFloorArea(): continue
-            if not isUnconditioned(other): continue
+            if t0 is None: continue
 
             ti = transforms(other)
             if ti["t"] is None: continue
 
-            ti = ti["t"]
+            ti  = ti["t"]
+            cv0 = t0 * ceiling.vertices()
 
             for roof in facets(other, "Outdoors", "RoofCeiling"):
                 ide = roof.nameString()
@@ -7343,9 +7250,18 @@ def grossRoofArea(spaces=[]) -> float:
 
                 m2 = m2.get()
                 if m2 < CN.TOL2: continue
-                if ide not in rfs: rfs[ide] = dict(m2=0, m=other.multiplier())
+                if ide not in attcs: attcs[ide] = dict(m2=0, m=mo)
 
-                rfs[ide]["m2"] += m2
+                attcs[ide]["m2"] += m2
+
+    # Tally plenum roofs, then attic roofs (as initially sequenced).
+    rfs.update(plnms)
+
+    for ide, rf in attcs.items():
+        if ide in rfs:
+            rfs[ide]["m2"] += rf["m2"]
+        else:
+            rfs[ide] = rf
 
     for rf in rfs.values():
         rm2 += rf["m2"] * rf["m"]
@@ -7611,7 +7527,7 @@ def addSkyLights(spaces=[], opts=dict) -> float:
     bfr   = 0.005 # minimum array perimeter buffer (no wells)
     w     = 1.22  # default 48" x 48" skylight base
     w2    = w * w # m2
-    v     = int("".join(openstudio.openStudioVersion().split(".")))
+    v     = _osv
 
     # --- --- --- --- --- --- --- --- --- --- --- --- --- --- --- --- --- --- #
     # Excerpts of ASHRAE 90.1 2022 definitions:
@@ -7756,11 +7672,21 @@ def addSkyLights(spaces=[], opts=dict) -> float:
         w2 = w * w
 
     f2  = 2 * f
+    bf  = bfr + f # array perimeter buffer, incl. frame
+    bf2 = 2 * bf
     w0  = w + f2
     w02 = w0 * w0
     wl  = w0 + gap
     wl2 = wl * wl
 
+    # Rounded size thresholds, reused throughout candidate roof/ceiling loops.
+    w0r  = round(w0,  2)
+    wlr  = round(wl,  2)
+    w02r = round(w02, 2)
+    wl2r = round(wl2, 2)
+    rb2r = round(3 * wl2, 2) # min. room roof box (3x wl by wl)
+    gb2r = round(6 * wl2, 2) # min. attic/plenum roof box (3x wl by 2x wl)
+
     # Validate requested skylight-to-roof ratio (or overall area).
     if "area" in opts:
         try:
@@ -7791,7 +7717,8 @@ def addSkyLights(spaces=[], opts=dict) -> float:
         try:
             clear = bool(clear)
         except:
-            log(CN.WRN, "Purging existing skylights by default (%s)" % mth)
+            m = "Purging existing skylights by default (%s)" % mth
+            oslg.log(CN.WRN, m)
             clear = True
 
     # Purge if requested.
@@ -7812,7 +7739,7 @@ def addSkyLights(spaces=[], opts=dict) -> float:
 
         for roof in facets(space, "Outdoors", "RoofCeiling"):
             for sub in roof.subSurfaces():
-                if not isFenestration(sub): continue
+                if not isFenestrated(sub): continue
 
                 ide = sub.nameString()
                 xm2 = sub.grossArea()
@@ -7839,7 +7766,7 @@ def addSkyLights(spaces=[], opts=dict) -> float:
     sm2 = area if area else rm2 * srr - m2
 
     # Warn/skip if existing skylights exceed or ~roughly match targets.
-    if round(sm2, 2) < round(w02, 2):
+    if round(sm2, 2) < w02r:
         if m2 > 0:
             oslg.log(CN.INF, "Skip: skylight area > request (%s)" % mth)
             return rm2
@@ -7961,21 +7888,16 @@ def addSkyLights(spaces=[], opts=dict) -> float:
     filters = ["a", "b", "bc", "bcd", "bcde"]
 
     # Prune filters, based on user-selected options.
-    for opt in ["sidelit", "sloped", "plenum", "attic"]:
+    drop = set()
+
+    for opt, fil in dict(sidelit="b", sloped="c", plenum="d", attic="e").items():
         if opt not in opts: continue
         if opts[opt] is True: continue
 
-        if opt == "sidelit":
-            filters = [fil for fil in filters if "b" not in fil]
-        elif opt == "sloped":
-            filters = [fil for fil in filters if "c" not in fil]
-        elif opt == "plenum":
-            filters = [fil for fil in filters if "d" not in fil]
-        elif opt == "attic":
-            filters = [fil for fil in filters if "e" not in fil]
+        drop.add(fil)
 
-    filters = [fil for fil in filters if fil] # prune out any emptied pattern
-    filters = list(set(filters))              # ensure uniqueness
+    filters = [fil for fil in filters if fil and not set(fil) & drop]
+    filters = list(dict.fromkeys(filters)) # ensure (ordered) uniqueness
 
     # Remaining filters may be further pruned automatically after space/roof
     # processing, depending on geometry, e.g.:
@@ -7991,12 +7913,36 @@ def addSkyLights(spaces=[], opts=dict) -> float:
     plenums  = {} # unoccupied (INDIRECTLY-) CONDITIONED spaces above rooms
     attics   = {} # unoccupied UNCONDITIONED spaces above rooms
     ceilings = {} # of occupied CONDITIONED space (if plenums/attics)
+    rfz      = {} # memoized attic/plenum roof attributes (e.g. isRoof)
+    spz      = {} # memoized attic/plenum space attributes (e.g. transforms)
 
     # Candidate 'rooms' to toplit - excludes plenums/attics.
     for space in spaces:
-        ide = space.nameString()
+        ide   = space.nameString()
+        mx    = space.multiplier()
+        rufs  = [] # outdoor-facing roof surfaces
+        clngs = [] # ceilings (e.g. below plenums, attics)
+        side  = False # sidelit?
+        top   = False # toplit?
+
+        # Sort out room roofs vs ceilings, in a single pass. Also flags whether
+        # the room is sidelit or toplit, i.e. as would 2x 'isDaylit' calls.
+        for s in space.surfaces():
+            typ = s.surfaceType().lower()
+            bnd = s.outsideBoundaryCondition().lower()
+
+            if typ == "roofceiling" and bnd == "outdoors":
+                rufs.append(s)
 
-        if isDaylit(space, False, True, False):
+                if not top:
+                    top = any(isFenestrated(sub) for sub in s.subSurfaces())
+            elif typ == "roofceiling" and bnd == "surface":
+                clngs.append(s)
+            elif typ == "wall" and bnd == "outdoors":
+                if not side:
+                    side = any(isFenestrated(sub) for sub in s.subSurfaces())
+
+        if top:
             oslg.log(CN.WRN, "%s is already toplit, skipping (%s)" % (ide, mth))
             continue
 
@@ -8017,10 +7963,12 @@ def addSkyLights(spaces=[], opts=dict) -> float:
         rooms[ide]            = {}
         rooms[ide]["space"  ] = space
         rooms[ide]["t0"     ] = t0["t"]
-        rooms[ide]["m"      ] = space.multiplier()
+        rooms[ide]["t0i"    ] = t0["t"].inverse()
+        rooms[ide]["m"      ] = mx
         rooms[ide]["h"      ] = h
-        rooms[ide]["roofs"  ] = facets(space, "Outdoors", "RoofCeiling")
-        rooms[ide]["sidelit"] = isDaylit(space, True, False, False)
+        rooms[ide]["roofs"  ] = rufs
+        rooms[ide]["clngs"  ] = clngs
+        rooms[ide]["sidelit"] = side
 
         # Fetch and process room-specific outdoor-facing roof surfaces.
         #   e.g. the most basic 'subset' to track:
@@ -8030,6 +7978,10 @@ def addSkyLights(spaces=[], opts=dict) -> float:
         for roof in rooms[ide]["roofs"]:
             if not isRoof(roof): continue
 
+            # A roof bounded box can't exceed its roof area: skip (costlier)
+            # bounded box searches for roofs too small to hold a subset box.
+            if round(roof.grossArea(), 2) < rb2r: continue
+
             vtx = roof.vertices()
             box = boundedBox(vtx)
             if not box: continue
@@ -8038,10 +7990,9 @@ def addSkyLights(spaces=[], opts=dict) -> float:
             if not bm2: continue
 
             bm2 = bm2.get()
-            if round(bm2, 2) < round(w02, 2): continue
+            if round(bm2, 2) < w02r: continue
 
-            width = alignedWidth(box, True)
-            depth = alignedHeight(box, True)
+            width, depth = _alignedSize(box)
             if width < wl * 3: continue
             if depth < wl: continue
 
@@ -8060,7 +8011,7 @@ def addSkyLights(spaces=[], opts=dict) -> float:
             sset["thin"   ] = thin
             sset["roof"   ] = roof
             sset["space"  ] = space
-            sset["m"      ] = space.multiplier()
+            sset["m"      ] = mx
             sset["sidelit"] = rooms[ide]["sidelit"]
             sset["sloped" ] = isSloped(roof)
             sset["t0"     ] = rooms[ide]["t0"]
@@ -8069,14 +8020,38 @@ def addSkyLights(spaces=[], opts=dict) -> float:
 
     # Process outdoor-facing roof surfaces of plenums and attics above.
     for ide, room in rooms.items():
-        t0    = room["t0"]
+        t0    = room["t0" ]
+        t0i   = room["t0i"]
         space = room["space"]
         rufs  = [ruf for ruf in roofs(space) if ruf not in room["roofs"]]
+        clngs = []
+
+        # Room ceilings (site coordinates), along with their XY bounds. Roof
+        # surfaces above are only vertically cast onto ceilings with
+        # intersecting XY bounds: a cheap rejection test, before otherwise
+        # systematically casting/overlapping each roof/ceiling pair. Vertices
+        # are held as Point3dVectors, reused as is for each cast/overlap.
+        for clng in room["clngs"]:
+            tpts = p3Dv(t0 * clng.vertices())
+            xs   = [pt.x() for pt in tpts]
+            ys   = [pt.y() for pt in tpts]
+            xy   = (min(xs), min(ys), max(xs), max(ys))
+            cm2  = clng.grossArea()
+            clngs.append(dict(clng=clng, tpts=tpts, xy=xy, m2=cm2))
 
         for ruf in rufs:
             id0 = ruf.nameString()
             vtx = ruf.vertices()
-            if not isRoof(ruf): continue
+
+            # Attic/plenum roofs are often shared across rooms below. As with
+            # room roofs, roof/ceiling overlaps can't exceed roof areas.
+            if id0 not in rfz:
+                rfz[id0] = dict(roof=isRoof(ruf), sloped=None, t=None)
+
+                if round(ruf.grossArea(), 2) < gb2r:
+                    rfz[id0]["roof"] = False
+
+            if not rfz[id0]["roof"]: continue
 
             espace = ruf.space()
             if not espace: continue
@@ -8087,22 +8062,51 @@ def addSkyLights(spaces=[], opts=dict) -> float:
             idx = espace.nameString()
             mx  = espace.multiplier()
 
-            if mx != space.multiplier():
+            if mx != room["m"]:
                 m = "%s vs %s - multiplier mismatch (%s)" % (ide, idx, mth)
-                log(CN.ERR, m)
+                oslg.log(CN.ERR, m)
                 continue
 
-            ti = transforms(espace)
-            if not ti["t"]: continue
+            if idx not in spz:
+                tx = transforms(espace)["t"]
+                spz[idx] = dict(t=tx, inv=None, attic=None)
+
+                if tx: spz[idx]["inv"] = tx.inverse()
+
+            ti  = spz[idx]["t"  ]
+            tii = spz[idx]["inv"]
+            if not ti: continue
+
+            # Roof vertices (site coordinates) and XY bounds, set once per roof.
+            if "rpts" not in rfz[id0]:
+                rpts = p3Dv(ti * vtx)
+                xs   = [pt.x() for pt in rpts]
+                ys   = [pt.y() for pt in rpts]
+                n    = openstudio.getOutwardNormal(rpts)
+                rfz[id0]["rpts"] = rpts
+                rfz[id0]["xy"  ] = (min(xs), min(ys), max(xs), max(ys))
+                rfz[id0]["nz"  ] = abs(n.get().z()) if n else 0
 
-            ti   = ti["t"]
-            rpts = ti * vtx
+            rpts = rfz[id0]["rpts"]
+            rxy  = rfz[id0]["xy"  ]
+            nz   = rfz[id0]["nz"  ]
+            if nz < CN.TOL: continue
 
             # Process occupied room ceilings, as 1x or more are overlapping roof
             # surfaces above. Vertically cast, then fetch overlap.
-            for clng in facets(space, "Surface", "RoofCeiling"):
+            for c in clngs:
+                cxy = c["xy"]
+                if cxy[0] >= rxy[2] or cxy[2] <= rxy[0]: continue
+                if cxy[1] >= rxy[3] or cxy[3] <= rxy[1]: continue
+
+                # Once vertically cast onto the roof, a ceiling can't exceed
+                # its own area divided by the roof's normal Z-axis component:
+                # neither can their overlap, nor the (well) box it must hold.
+                if round(c["m2"] / nz, 2) < gb2r: continue
+
+                clng = c["clng"]
                 idee = clng.nameString()
-                tpts = t0 * clng.vertices()
+                tpts = c["tpts"]
                 ci0  = cast(tpts, rpts, ray)
                 if not ci0: continue
 
@@ -8113,7 +8117,7 @@ def addSkyLights(spaces=[], opts=dict) -> float:
                 if not om2: continue
 
                 om2 = om2.get()
-                if round(om2, 2) < round(w02, 2): continue
+                if round(om2, 2) < w02r: continue
 
                 box = boundedBox(olap)
                 if not box: continue
@@ -8133,10 +8137,9 @@ def addSkyLights(spaces=[], opts=dict) -> float:
                 if not bm2: continue
 
                 bm2 = bm2.get()
-                if round(bm2, 2) < round(wl2, 2): continue
+                if round(bm2, 2) < wl2r: continue
 
-                width = alignedWidth(box, True)
-                depth = alignedHeight(box, True)
+                width, depth = _alignedSize(box)
                 if width < wl * 3: continue
                 if depth < wl * 2: continue
 
@@ -8148,8 +8151,8 @@ def addSkyLights(spaces=[], opts=dict) -> float:
                 if not cm2: continue
 
                 cm2  = cm2.get()
-                box  = ti.inverse() * box
-                cbox = t0.inverse() * cbox
+                box  = tii * box
+                cbox = t0i * cbox
 
                 if idee not in ceilings:
                     floor = clng.adjacentSurface()
@@ -8177,6 +8180,14 @@ def addSkyLights(spaces=[], opts=dict) -> float:
 
                 ceilings[idee]["roofs"].append(ruf)
 
+                # Roof alignment (and slope) shared across ceilings below.
+                if rfz[id0]["t"] is None:
+                    rfz[id0]["t"     ] = openstudio.Transformation.alignFace(vtx)
+                    rfz[id0]["sloped"] = isSloped(ruf)
+
+                if spz[idx]["attic"] is None:
+                    spz[idx]["attic"] = isUnconditioned(espace)
+
                 # Skylight subset key:values are more detailed with suspended
                 # ceilings. The overlap ("olap") remains in 'transformed' site
                 # coordinates (with regards to the roof). The "box" polygon
@@ -8194,15 +8205,15 @@ def addSkyLights(spaces=[], opts=dict) -> float:
                 sset["thin"   ] = False
                 sset["roof"   ] = ruf
                 sset["space"  ] = space
-                sset["m"      ] = space.multiplier()
+                sset["m"      ] = room["m"]
                 sset["clng"   ] = clng
                 sset["t0"     ] = t0
                 sset["ti"     ] = ti
-                sset["t"      ] = openstudio.Transformation.alignFace(vtx)
+                sset["t"      ] = rfz[id0]["t"     ]
                 sset["sidelit"] = room["sidelit"]
-                sset["sloped" ] = isSloped(ruf)
+                sset["sloped" ] = rfz[id0]["sloped"]
 
-                if isUnconditioned(espace): # e.g. attic
+                if spz[idx]["attic"]: # e.g. attic
                     if idx not in attics:   # idx = espace.nameString()
                         attics[idx]          = {}
                         attics[idx]["space"] = espace
@@ -8238,43 +8249,55 @@ def addSkyLights(spaces=[], opts=dict) -> float:
 
     # Ensure uniqueness of plenum roofs.
     for attic in attics.values():
-        ruufs = []
-        ruufs = [ruf for ruf in attic["roofs"] if ruf not in ruufs]
-        attic["roofs" ] = ruufs
+        ruufs = {}
+
+        for ruf in attic["roofs"]: ruufs.setdefault(ruf.nameString(), ruf)
+
+        attic["roofs" ] = list(ruufs.values())
         attic["ridges"] = horizontalRidges(attic["roofs"]) # @todo
 
     for plenum in plenums.values():
-        ruufs = []
-        ruufs = [ruf for ruf in plenum["roofs"] if ruf not in ruufs]
-        plenum["roofs" ] = ruufs
+        ruufs = {}
+
+        for ruf in plenum["roofs"]: ruufs.setdefault(ruf.nameString(), ruf)
+
+        plenum["roofs" ] = list(ruufs.values())
         plenum["ridges"] = horizontalRidges(plenum["roofs"]) # @todo
 
     # Regardless of the selected skylight arrangement pattern, the solution only
     # considers attic/plenum subsets that can be successfully linked to leader
     # line anchors, for both roof and ceiling surfaces. First, attic/plenum roofs.
-    for greniers in [attics, plenums]:
-        k = "attic" if greniers == attics else "plenum"
+    # Each subset holds "space", "box", "bm2" & "roof" keys (see above), so
+    # subsets are indexed by roof ID (and by attic/plenum ID) once, rather than
+    # filtered per roof (void subsets are later skipped).
+    rsets = {}
+    gsets = {}
+
+    for sset in ssets:
+        idr = sset["roof"].nameString()
+        rsets.setdefault(idr, []).append(sset)
+
+        for k in ("attic", "plenum"):
+            if k not in sset: continue
+
+            ide = (k, idr, sset[k].nameString())
+            gsets.setdefault(ide, []).append(sset)
+
+    for greniers, k in ((attics, "attic"), (plenums, "plenum")):
+        if not greniers: continue
 
         for grenier in greniers.values():
+            ids = grenier["space"].nameString()
+
             for roof in grenier["roofs"]:
-                sts = ssets
-                sts = [st for st in sts if k       in st]
-                sts = [st for st in sts if "space" in st]
-                sts = [st for st in sts if "box"   in st]
-                sts = [st for st in sts if "bm2"   in st]
-                sts = [st for st in sts if "roof"  in st]
-
-                sts = [st for st in sts if st[k     ] == grenier["space"]]
-                sts = [st for st in sts if st["roof"] == roof]
+                sts = gsets.get((k, roof.nameString(), ids), [])
                 if not sts: continue
 
-                sts = sorted(sts, key=lambda st: st["bm2"], reverse=True)
+                sts = sorted(sts, key=itemgetter("bm2"), reverse=True)
                 genAnchors(roof, sts, "box")
 
-    # Delete voided sets.
-    ssets = [sset for sset in ssets if "void" not in sset]
-
-    # Repeat leader line loop for ceilings.
+    # Repeat leader line loop for ceilings. Subsets voided above are skipped,
+    # then deleted along with those voided below.
     for ceiling in ceilings.values():
         k = "attic" if "attic" in ceiling else "plenum"
         if k not in ceiling: continue
@@ -8287,18 +8310,10 @@ def addSkyLights(spaces=[], opts=dict) -> float:
         stz = []
 
         for roof in ceiling["roofs"]:
-            sts = ssets
-
-            sts = [st for st in sts if k       in st]
-            sts = [st for st in sts if "cbox"  in st]
-            sts = [st for st in sts if "cm2"   in st]
-            sts = [st for st in sts if "roof"  in st]
-            sts = [st for st in sts if "clng"  in st]
-            sts = [st for st in sts if "space" in st]
-
-            sts = [st for st in sts if st[k      ] == espace]
-            sts = [st for st in sts if st["roof" ] == roof]
-            sts = [st for st in sts if st["clng" ] == clng]
+            # Attic/plenum subsets also hold "cbox", "cm2" & "clng" keys.
+            sts = rsets.get(roof.nameString(), [])
+            sts = [st for st in sts if "void" not in st and k in st]
+            sts = [st for st in sts if st[k] == espace and st["clng"] == clng]
             sts = [st for st in sts if st["space"] == space]
             if len(sts) != 1: continue
 
@@ -8306,7 +8321,7 @@ def addSkyLights(spaces=[], opts=dict) -> float:
 
         if not stz: continue
 
-        stz = sorted(stz, key=lambda st: st["cm2"], reverse=True)
+        stz.sort(key=itemgetter("cm2"), reverse=True)
         genAnchors(clng, stz, "cbox")
 
     # Delete voided sets.
@@ -8314,7 +8329,7 @@ def addSkyLights(spaces=[], opts=dict) -> float:
     if not ssets: return oslg.empty("subsets", mth, CN.WRN, rm2)
 
     # Sort subsets, from largest to smallest bounded box area.
-    ssets = sorted(ssets, key=lambda st: st["bm2"] * st["m"], reverse=True)
+    ssets.sort(key=lambda st: st["bm2"] * st["m"], reverse=True)
 
     # Any sidelit and/or sloped roofs being targeted?
     # @todo: enable double-ridged, sloped roofs have double-sloped
@@ -8342,36 +8357,39 @@ def addSkyLights(spaces=[], opts=dict) -> float:
         space  = sset["space"]
         room   = rooms[space.nameString()]
         h      = room["h"]
-        width  = alignedWidth( sset["box"], True)
-        depth  = alignedHeight(sset["box"], True)
+        width, depth = _alignedSize(sset["box"])
         barea  = sset["om2"] if "om2" in sset else sset["bm2"]
         rtio   = barea / avm2
         skym2  = srr2 * barea * rtio
+        tgtm2  = factor * round(skym2, 2) # rounded (inflated) target
 
         # Flag subset if too narrow/shallow to hold a single skylight.
         if well:
-            if round(width, 2) < round(wl, 2):
+            if round(width, 2) < wlr:
                 oslg.log(CN.WRN, "subset #{i+1} well: Too narrow (%s)" % mth)
                 sset["void"] = True
                 continue
 
-            if round(depth, 2) < round(wl, 2):
+            if round(depth, 2) < wlr:
                 oslg.log(CN.WRN, "subset #{i+1} well: Too shallow (%s)" % mth)
                 sset["void"] = True
                 continue
         else:
-            if round(width, 2) < round(w0, 2):
+            if round(width, 2) < w0r:
                 oslg.log(CN.WRN, "subset #{i+1}: Too narrow (%s)" % mth)
                 sset["void"] = True
                 continue
 
-            if round(depth, 2) < round(w0, 2):
+            if round(depth, 2) < w0r:
                 oslg.log(CN.WRN, "subset #{i+1}: Too shallow (%s)" % mth)
                 sset["void"] = True
                 continue
 
         # Estimate number of skylight modules per 'pattern'. Default spacing
         # varies based on bounded box size (i.e. larger vs smaller rooms).
+        found = False
+        wo    = wl if well else w0 # initial skylight (or well) width/depth
+
         for pattern in patterns:
             cols = 1
             rows = 1
@@ -8388,47 +8406,35 @@ def addSkyLights(spaces=[], opts=dict) -> float:
                 if thin: continue
 
                 if tight:
-                    sp = 1.4 * h / 2
-                    lx = width - cols * wx
-                    ly = depth - rows * wy
-                    if round(lx, 2) < round(sp, 2): continue
-                    if round(ly, 2) < round(sp, 2): continue
-
-                    cols = int(round((width - wx) / (wx + sp)), 2) + 1
-                    rows = int(round((depth - wy) / (wy + sp)), 2) + 1
+                    sp  = 1.4 * h / 2
+                    spr = round(sp, 2)
+                    lx  = width - cols * wx
+                    ly  = depth - rows * wy
+                    if round(lx, 2) < spr: continue
+                    if round(ly, 2) < spr: continue
+
+                    cols = int(round((width - wx) / (wx + sp), 2)) + 1
+                    rows = int(round((depth - wy) / (wy + sp), 2)) + 1
                     if cols < 2: continue
                     if rows < 2: continue
 
-                    dX = bfr + f
-                    dY = bfr + f
+                    dX = bf
+                    dY = bf
                 else:
-                    sp = 1.4 * h
-
-                    if well:
-                        lx = (width - cols * wxl) / cols
-                        ly = (depth - rows * wyl) / rows
-                    else:
-                        lx = (width - cols * wx) / cols
-                        ly = (depth - rows * wy) / rows
+                    sp  = 1.4 * h
+                    spr = round(sp, 2)
 
-                    if round(lx, 2) < round(sp, 2): continue
-                    if round(ly, 2) < round(sp, 2): continue
-
-                    if well:
-                        cols = int(round(width / (wxl + sp), 2))
-                        rows = int(round(depth / (wyl + sp), 2))
-                    else:
-                        cols = int(round(width / (wx + sp), 2))
-                        rows = int(round(depth / (wy + sp), 2))
+                    lx = (width - cols * wo) / cols
+                    ly = (depth - rows * wo) / rows
+                    if round(lx, 2) < spr: continue
+                    if round(ly, 2) < spr: continue
 
+                    cols = int(round(width / (wo + sp), 2))
+                    rows = int(round(depth / (wo + sp), 2))
                     if cols < 2: continue
                     if rows < 2: continue
 
-                    if well:
-                        ly = (depth - rows * wyl) / rows
-                    else:
-                        ly = (depth - rows * wy) / rows
-
+                    ly = (depth - rows * wo) / rows
                     dY = ly / 2
 
                 # Default allocated skylight area. If undershooting, inflate
@@ -8441,11 +8447,12 @@ def addSkyLights(spaces=[], opts=dict) -> float:
 
                 # Inflate skylight width/depth (and reduce spacing) to reach
                 # target.
-                if round(tm2, 2) < factor * round(skym2, 2):
+                if round(tm2, 2) < tgtm2:
                     ratio2 = 1 + (factor * skym2 - tm2) / tm2
                     ratio  = math.sqrt(ratio2)
 
                     sp  = wl
+                    spr = round(sp, 2)
                     wx *= ratio
                     wy *= ratio
 
@@ -8454,18 +8461,18 @@ def addSkyLights(spaces=[], opts=dict) -> float:
                         wyl = wy + gap
 
                     if tight:
-                        lx = (width - 2 * (bfr + f) - cols * wx) / (cols - 1)
-                        ly = (depth - 2 * (bfr + f) - rows * wy) / (rows - 1)
-                        lx = sp if round(lx, 2) < round(sp, 2) else lx
-                        ly = sp if round(ly, 2) < round(sp, 2) else ly
-                        wx = (width - 2 * (bfr + f) - (cols - 1) * lx) / cols
-                        wy = (depth - 2 * (bfr + f) - (rows - 1) * ly) / rows
+                        lx = (width - bf2 - cols * wx) / (cols - 1)
+                        ly = (depth - bf2 - rows * wy) / (rows - 1)
+                        lx = sp if round(lx, 2) < spr else lx
+                        ly = sp if round(ly, 2) < spr else ly
+                        wx = (width - bf2 - (cols - 1) * lx) / cols
+                        wy = (depth - bf2 - (rows - 1) * ly) / rows
                     else:
                         if well:
                             lx  = (width - cols * wxl) / cols
                             ly  = (depth - rows * wyl) / rows
-                            lx  = sp if round(lx, 2) < round(sp, 2) else lx
-                            ly  = sp if round(ly, 2) < round(sp, 2) else ly
+                            lx  = sp if round(lx, 2) < spr else lx
+                            ly  = sp if round(ly, 2) < spr else ly
                             wxl = (width - cols * lx) / cols
                             wyl = (depth - rows * ly) / rows
                             wx  = wxl - gap
@@ -8474,8 +8481,8 @@ def addSkyLights(spaces=[], opts=dict) -> float:
                         else:
                             lx  = (width - cols * wx) / cols
                             ly  = (depth - rows * wy) / rows
-                            lx  = sp if round(lx, 2) < round(sp, 2) else lx
-                            ly  = sp if round(ly, 2) < round(sp, 2) else ly
+                            lx  = sp if round(lx, 2) < spr else lx
+                            ly  = sp if round(ly, 2) < spr else ly
                             wx  = (width - cols * lx) / cols
                             wy  = (depth - rows * ly) / rows
                             ly  = (depth - rows * wy) / rows
@@ -8486,58 +8493,53 @@ def addSkyLights(spaces=[], opts=dict) -> float:
                 cols = 2
 
                 if tight:
-                    sp = h / 2
-                    dX = bfr + f
-                    lx = width - cols * wx
-                    if round(lx, 2) < round(sp, 2): continue
+                    sp  = h / 2
+                    spr = round(sp, 2)
+                    dX  = bf
+                    lx  = width - cols * wx
+                    if round(lx, 2) < spr: continue
 
-                    cols = int(round((width - wx) / (wx + sp)), 2) + 1
+                    cols = int(round((width - wx) / (wx + sp), 2)) + 1
                     if cols < 2: continue
 
                     if thin:
-                        dY = bfr + f
+                        dY = bf
                         wy = depth - 2 * dY
                         if round(wy, 2) < gap4: continue
                     else:
                         ly = depth - wy
-                        if round(ly, 2) < round(wl, 2): continue
+                        if round(ly, 2) < wlr: continue
 
-                    dY = ly / 2
+                        dY = ly / 2
                 else:
-                    sp = h
+                    sp  = h
+                    spr = round(sp, 2)
+                    lx  = (width - cols * wo) / cols
+                    if round(lx, 2) < spr: continue
 
-                    if well:
-                        lx = (width - cols * wxl) / cols
-                        if round(lx, 2) < round(sp, 2): continue
-
-                        cols = int(round(width / (wxl + sp), 2))
-                        if cols < 2: continue
+                    cols = int(round(width / (wo + sp), 2))
+                    if cols < 2: continue
 
+                    if well:
                         ly = depth - wyl
                         dY = ly / 2
-                        if round(ly, 2) < round(wl, 2): continue
+                        if round(ly, 2) < wlr: continue
+                    elif thin:
+                        dY = bf
+                        wy = depth - 2 * dY
+                        if round(wy, 2) < gap4: continue
                     else:
-                        lx = (width - cols * wx) / cols
-                        if round(lx, 2) < round(sp, 2): continue
-
-                        cols = int(round(width / (wx + sp), 2))
-                        if cols < 2: continue
-
-                        if thin:
-                            dY = bfr + f
-                            wy = depth - 2 * dY
-                            if round(wy, 2) < gap4: continue
-                        else:
-                            ly = depth - wy
-                            if round(ly, 2) < round(wl, 2): continue
+                        ly = depth - wy
+                        if round(ly, 2) < wlr: continue
 
-                            dY = ly / 2
+                        dY = ly / 2
 
                 tm2 = wx * cols * wy
 
                 # Inflate skylight depth to reach target.
-                if round(tm2, 2) < factor * round(skym2, 2):
-                    sp = wl
+                if round(tm2, 2) < tgtm2:
+                    sp  = wl
+                    spr = round(sp, 2)
 
                     # Skip if already thin.
                     if not thin:
@@ -8548,12 +8550,12 @@ def addSkyLights(spaces=[], opts=dict) -> float:
                         if well:
                             wyl = wy + gap
                             ly  = depth - wyl
-                            ly  = sp if round(ly, 2) < round(sp, 2) else ly
+                            ly  = sp if round(ly, 2) < spr else ly
                             wyl = depth - ly
                             wy  = wyl - gap
                         else:
                             ly = depth - wy
-                            ly = sp if round(ly, 2) < round(sp, 2) else ly
+                            ly = sp if round(ly, 2) < spr else ly
                             wy = depth - ly
 
                         dY = ly / 2
@@ -8561,54 +8563,56 @@ def addSkyLights(spaces=[], opts=dict) -> float:
                 tm2 = wx * cols * wy
 
                 # Inflate skylight width (and reduce spacing) to reach target.
-                if round(tm2, 2) < factor * round(skym2, 2):
+                if round(tm2, 2) < tgtm2:
                     ratio2 = 1 + (factor * skym2 - tm2) / tm2
 
                     wx *= ratio2
                     if well: wxl = wx + gap
 
                     if tight:
-                        lx = (width - 2 * (bfr + f) - cols * wx) / (cols - 1)
-                        lx = sp if round(lx, 2) < round(sp, 2) else lx
-                        wx = (width - 2 * (bfr + f) - (cols - 1) * lx) / cols
+                        lx = (width - bf2 - cols * wx) / (cols - 1)
+                        lx = sp if round(lx, 2) < spr else lx
+                        wx = (width - bf2 - (cols - 1) * lx) / cols
                     else:
                         if well:
                             lx  = (width - cols * wxl) / cols
-                            lx  = sp if round(lx, 2) < round(sp, 2) else lx
+                            lx  = sp if round(lx, 2) < spr else lx
                             wxl = (width - cols * lx) / cols
                             wx  = wxl - gap
                         else:
                             lx  = (width - cols * wx) / cols
-                            lx  = sp if round(lx, 2) < round(sp, 2) else lx
+                            lx  = sp if round(lx, 2) < spr else lx
                             wx  = (width - cols * lx) / cols
 
             else: # "strip" 1 (long?) row x 1 column
                 if tight:
-                    sp = gap4
-                    dX = bfr + f
-                    wx = width - 2 * dX
-                    if round(wx, 2) < round(sp, 2): continue
+                    sp  = gap4
+                    spr = round(sp, 2)
+                    dX  = bf
+                    wx  = width - 2 * dX
+                    if round(wx, 2) < spr: continue
 
                     if thin:
-                        dY = bfr + f
+                        dY = bf
                         wy = depth - 2 * dY
-                        if round(wy, 2) < round(sp, 2): continue
+                        if round(wy, 2) < spr: continue
                     else:
                         ly = depth - wy
                         dY = ly / 2
-                        if round(ly, 2) < round(sp, 2): continue
+                        if round(ly, 2) < spr: continue
                 else:
-                    sp = wl
-                    lx = width - wxl if well else width - wx
-                    ly = depth - wyl if well else depth - wy
-                    dY = ly / 2
-                    if round(lx, 2) < round(sp, 2): continue
-                    if round(ly, 2) < round(sp, 2): continue
+                    sp  = wl
+                    spr = round(sp, 2)
+                    lx  = width - wo
+                    ly  = depth - wo
+                    dY  = ly / 2
+                    if round(lx, 2) < spr: continue
+                    if round(ly, 2) < spr: continue
 
                 tm2 = wx * wy
 
                 # Inflate skylight width (and reduce spacing) to reach target.
-                if round(tm2, 2) < factor * round(skym2, 2):
+                if round(tm2, 2) < tgtm2:
                     if not tight:
                         ratio2 = 1 + (factor * skym2 - tm2) / tm2
 
@@ -8617,18 +8621,18 @@ def addSkyLights(spaces=[], opts=dict) -> float:
                         if well:
                             wxl = wx + gap
                             lx  = width - wxl
-                            lx  = sp if round(lx, 2) < round(sp, 2) else lx
+                            lx  = sp if round(lx, 2) < spr else lx
                             wxl = width - lx
                             wx  = wxl - gap
                         else:
                             lx  = width - wx
-                            lx  = sp if round(lx, 2) < round(sp, 2) else lx
+                            lx  = sp if round(lx, 2) < spr else lx
                             wx  = width - lx
 
                 tm2 = wx * wy
 
                 # Inflate skylight depth to reach target. Skip if already tight thin.
-                if round(tm2, 2) < factor * round(skym2, 2):
+                if round(tm2, 2) < tgtm2:
                     if not thin:
                         ratio2 = 1 + (factor * skym2 - tm2) / tm2
 
@@ -8637,56 +8641,56 @@ def addSkyLights(spaces=[], opts=dict) -> float:
                         if well:
                             wyl = wy + gap
                             ly  = depth - wyl
-                            ly  = sp if round(ly, 2) < round(sp, 2) else ly
+                            ly  = sp if round(ly, 2) < spr else ly
                             wyl = depth - ly
                             wy  = wyl - gap
                         else:
                             ly = depth - wy
-                            ly = sp if round(ly, 2) < round(sp, 2) else ly
+                            ly = sp if round(ly, 2) < spr else ly
                             wy = depth - ly
 
                         dY = ly / 2
 
-            st          = {}
-            st["tight"] = tight
-            st["cols" ] = cols
-            st["rows" ] = rows
-            st["wx"   ] = wx
-            st["wy"   ] = wy
-            st["wxl"  ] = wxl
-            st["wyl"  ] = wyl
-
-            if dX: st["dX"] = dX
-            if dY: st["dY"] = dY
+            sset[pattern] = _Pattern(tight, cols, rows, wx, wy, wxl, wyl, dX, dY)
+            found         = True
 
-            sset[pattern] = st
-
-        if not any(pattern in sset for pattern in patterns): sset["void"] = True
+        if not found: sset["void"] = True
 
     # Delete voided subsets.
     ssets = [sset for sset in ssets if "void" not in sset]
     if not ssets: return oslg.empty("subsets (2)", mth, CN.WRN, rm2)
 
     # Final reset of filters.
-    if not sidelit: filters = [fil.replace("b", "") for fil in filters]
-    if not sloped:  filters = [fil.replace("c", "") for fil in filters]
-    if not plenums: filters = [fil.replace("d", "") for fil in filters]
-    if not attics:  filters = [fil.replace("e", "") for fil in filters]
+    drop = set()
+    if not sidelit: drop.add("b")
+    if not sloped:  drop.add("c")
+    if not plenums: drop.add("d")
+    if not attics:  drop.add("e")
 
+    filters = ["".join(c for c in fil if c not in drop) for fil in filters]
     filters = [fil for fil in filters if fil] # remove any empty filter strings
-    flters  = []
-    flters  = [fil for fil in filters if fil not in flters] # ensure uniqueness
-    filters = flters
+    filters = list(dict.fromkeys(filters))    # ensure (ordered) uniqueness
 
     # Initialize skylight area tally (to increment).
     skm2 = 0
 
+    # Index subsets by roof (and ceiling) IDs: each roof/ceiling pair is unique.
+    pairs = {}
+
+    for sset in ssets:
+        idc = sset["clng"].nameString() if "clng" in sset else None
+        pairs.setdefault((sset["roof"].nameString(), idc), []).append(sset)
+
+    # Subsets yet to be assigned a pattern, pruned as patterns get assigned.
+    free = list(ssets)
+
     # Assign skylight pattern.
     for filter in filters:
         if round(skm2, 2) >= round(sm2, 2): continue
 
-        dm2 = sm2 - skm2 # differential (remaining skylight area to meet).
-        sts = [sset for sset in ssets if "pattern" not in sset]
+        dm2  = sm2 - skm2 # differential (remaining skylight area to meet).
+        free = [st for st in free if "pattern" not in st]
+        sts  = free
 
         if "a" in filter:
             # Start with the default (ideal) allocation selection:
@@ -8712,10 +8716,11 @@ def addSkyLights(spaces=[], opts=dict) -> float:
             for st in sts:
                 if pattern not in st: continue
 
-                cols = st[pattern]["cols"]
-                rows = st[pattern]["rows"]
-                wx   = st[pattern]["wx"  ]
-                wy   = st[pattern]["wy"  ]
+                pat  = st[pattern]
+                cols = pat.cols
+                rows = pat.rows
+                wx   = pat.wx
+                wy   = pat.wy
 
                 if pattern not in fpm2: fpm2[pattern] = dict(m2=0, tight=False)
 
@@ -8727,20 +8732,21 @@ def addSkyLights(spaces=[], opts=dict) -> float:
 
         # Favour (large) arrays if meeting residual target, unless constrained.
         if "array" in fpm2:
-            if dm2 < fpm2["array"]["m2"]:
-                if "tight" not in fpm2["array"] or fpm2["array"]["tight"] is False:
-                    pattern = "array"
+            fa = fpm2["array"]
+            if dm2 < fa["m2"] and not fa.get("tight"): pattern = "array"
 
         if not pattern:
-            fpm2 = dict(sorted(fpm2.items(), key=lambda f2: f2[1]["m2"]))
-            mnM2 = list(fpm2.values())[ 0]["m2"]
-            mxM2 = list(fpm2.values())[-1]["m2"]
+            fpms = [f2["m2"] for f2 in fpm2.values()]
+            mnM2 = min(fpms)
+            mxM2 = max(fpms)
 
             if round(mnM2, 2) >= round(dm2, 2):
                 # If not large array, then retain pattern generating smallest
                 # skylight area if ALL patterns >= residual target
                 # (deterministic sorting).
-                fpm2 = dict(fpm2.items(), key=lambda f2: round(f2, 2) == round(mnM2, 2))
+                mn2  = round(mnM2, 2)
+                fpm2 = {k: f2 for k, f2 in fpm2.items()
+                        if round(f2["m2"], 2) == mn2}
 
                 if "array" in fpm2:
                     pattern = "array"
@@ -8751,7 +8757,9 @@ def addSkyLights(spaces=[], opts=dict) -> float:
             else:
                 # Pick pattern offering greatest skylight area
                 # (deterministic sorting).
-                fpm2 = dict(fpm2.items(), key=lambda f2: round(f2, 2) == round(mxM2, 2))
+                mx2  = round(mxM2, 2)
+                fpm2 = {k: f2 for k, f2 in fpm2.items()
+                        if round(f2["m2"], 2) == mx2}
 
                 if "strip" in fpm2:
                     pattern = "strip"
@@ -8764,27 +8772,22 @@ def addSkyLights(spaces=[], opts=dict) -> float:
 
         # Update matching subsets.
         for st in sts:
-            for sset in ssets:
-                if pattern not in sset: continue
-                if st["roof"] != sset["roof"]: continue
-                if not areSame(st["box"], sset["box"]): continue
+            idc = st["clng"].nameString() if "clng" in st else None
 
-                if "clng" in st:
-                    if not "clng" in sset: continue
-                    if st["clng"] != sset["clng"]: continue
+            for sset in pairs.get((st["roof"].nameString(), idc), []):
+                if pattern not in sset: continue
 
+                pat             = sset[pattern]
                 sset["pattern"] = pattern
-                sset["cols"   ] = sset[pattern]["cols"]
-                sset["rows"   ] = sset[pattern]["rows"]
-                sset["w"      ] = sset[pattern]["wx"  ]
-                sset["d"      ] = sset[pattern]["wy"  ]
-                sset["w0"     ] = sset[pattern]["wxl" ]
-                sset["d0"     ] = sset[pattern]["wyl" ]
-
-                if "dX" in sset[pattern] and sset[pattern]["dX"]:
-                    sset["dX"] = sset[pattern]["dX"]
-                if "dY" in sset[pattern] and sset[pattern]["dY"]:
-                    sset["dY"] = sset[pattern]["dY"]
+                sset["cols"   ] = pat.cols
+                sset["rows"   ] = pat.rows
+                sset["w"      ] = pat.wx
+                sset["d"      ] = pat.wy
+                sset["w0"     ] = pat.wxl
+                sset["d0"     ] = pat.wyl
+
+                if pat.dX: sset["dX"] = pat.dX
+                if pat.dY: sset["dY"] = pat.dY
 
     # Delete incomplete sets (same as rejected if 'voided').
     ssets = [sset for sset in ssets if "void" not in sset]
@@ -8805,9 +8808,7 @@ def addSkyLights(spaces=[], opts=dict) -> float:
     avm2 = sbm2 / len(ssets)
 
     if round(skm2, 2) > round(sm2, 2):
-        ssets.reverse()
-
-        for sset in ssets:
+        for sset in reversed(ssets):
             if round(skm2, 2) <= round(sm2, 2): break
 
             stm2 = sset["cols"] * sset["w"] * sset["rows"] * sset["d"] * sset["m"]
@@ -8817,8 +8818,6 @@ def addSkyLights(spaces=[], opts=dict) -> float:
             skm2 -= stm2
             sset["void"] = True
 
-        ssets.reverse()
-
     ssets = [sset for sset in ssets if "void" not in sset]
     if not ssets: return oslg.empty("subsets (4)", mth, CN.WRN, rm2)
 
@@ -8828,9 +8827,11 @@ def addSkyLights(spaces=[], opts=dict) -> float:
         ratio  = math.sqrt(ratio2)
 
         for sset in ssets:
-            am2 = sset["cols"] * sset["w"] * sset["rows"] * sset["d"] * sset["m"]
-            xr  = sset["w"]
-            yr  = sset["d"]
+            x0  = sset["w"]
+            y0  = sset["d"]
+            am2 = sset["cols"] * x0 * sset["rows"] * y0 * sset["m"]
+            xr  = x0
+            yr  = y0
 
             if xr > w0:
                 xr = w0 if xr * ratio < w0 else xr * ratio
@@ -8841,53 +8842,54 @@ def addSkyLights(spaces=[], opts=dict) -> float:
             xm2 = sset["cols"] * xr * sset["rows"] * yr * sset["m"]
             if round(xm2, 2) == round(am2, 2): continue
 
-            sset["dY"] += (sset["d"] - yr) / 2
-            if "dX" in sset: sset["dX"] += (sset["w"] - xr) / 2
+            sset["dY"] += (y0 - yr) / 2
+            if "dX" in sset: sset["dX"] += (x0 - xr) / 2
 
             sset["w" ] = xr
             sset["d" ] = yr
-            sset["w0"] = sset["w"] + gap
-            sset["d0"] = sset["d"] + gap
+            sset["w0"] = xr + gap
+            sset["d0"] = yr + gap
 
             skm2 -= (am2 - xm2)
 
     # Size contraction: round 2: prioritize larger subsets.
     adm2 = 0
+    bigs = [] # subsets with skylights still larger than requested
 
     for sset in ssets:
         if round(sset["w"], 2) <= w0: continue
         if round(sset["d"], 2) <= w0: continue
 
+        bigs.append(sset)
         adm2 += sset["cols"] * sset["w"] * sset["rows"] * sset["d"] * sset["m"]
 
     if round(skm2, 2) > round(sm2, 2) and round(adm2, 2) > round(sm2, 2):
         ratio2 = 1 - (adm2 - sm2) / adm2
         ratio  = math.sqrt(ratio2)
 
-        for sset in ssets:
-            if round(sset["w"], 2) <= w0: continue
-            if round(sset["d"], 2) <= w0: continue
-
-            am2 = sset["cols"] * sset["w"] * sset["rows"] * sset["d"] * sset["m"]
-            xr  = sset["w"]
-            yr  = sset["d"]
+        for sset in bigs:
+            x0  = sset["w"]
+            y0  = sset["d"]
+            am2 = sset["cols"] * x0 * sset["rows"] * y0 * sset["m"]
+            xr  = x0
+            yr  = y0
 
             if xr > w0:
                 xr = w0 if xr * ratio < w0 else xr * ratio
 
             if yr > w0:
-                yr = yw0 if r * ratio < w0 else yr * ratio
+                yr = w0 if yr * ratio < w0 else yr * ratio
 
             xm2 = sset["cols"] * xr * sset["rows"] * yr * sset["m"]
             if round(xm2, 2) == round(am2, 2): continue
 
-            sset["dY"] += (sset["d"] - yr) / 2
-            if "dX" in sset: sset["dX"] += (sset["w"] - xr) / 2
+            sset["dY"] += (y0 - yr) / 2
+            if "dX" in sset: sset["dX"] += (x0 - xr) / 2
 
             sset["w" ] = xr
             sset["d" ] = yr
-            sset["w0"] = sset["w"] + gap
-            sset["d0"] = sset["d"] + gap
+            sset["w0"] = xr + gap
+            sset["d0"] = yr + gap
 
             skm2 -= (am2 - xm2)
             adm2 -= (am2 - xm2)
@@ -8900,9 +8902,11 @@ def addSkyLights(spaces=[], opts=dict) -> float:
         for sset in ssets:
             if round(skm2, 2) <= round(sm2, 2): break
 
-            am2 = sset["cols"] * sset["w"] * sset["rows"] * sset["d"] * sset["m"]
-            xr  = sset["w"]
-            yr  = sset["d"]
+            x0  = sset["w"]
+            y0  = sset["d"]
+            am2 = sset["cols"] * x0 * sset["rows"] * y0 * sset["m"]
+            xr  = x0
+            yr  = y0
 
             if xr > gap4:
                 xr = gap4 if xr * ratio < gap4 else xr * ratio
@@ -8913,13 +8917,13 @@ def addSkyLights(spaces=[], opts=dict) -> float:
             xm2 = sset["cols"] * xr * sset["rows"] * yr * sset["m"]
             if round(xm2, 2) == round(am2, 2): continue
 
-            sset["dY"] += (sset["d"] - yr) / 2
-            if "dX" in sset: sset["dX"] += (sset["w"] - xr) / 2
+            sset["dY"] += (y0 - yr) / 2
+            if "dX" in sset: sset["dX"] += (x0 - xr) / 2
 
             sset["w" ] = xr
             sset["d" ] = yr
-            sset["w0"] = sset["w"] + gap
-            sset["d0"] = sset["d"] + gap
+            sset["w0"] = xr + gap
+            sset["d0"] = yr + gap
 
             skm2 -= (am2 - xm2)
 
@@ -8928,27 +8932,28 @@ def addSkyLights(spaces=[], opts=dict) -> float:
         oslg.log(CN.WRN, "Skylights slightly oversized (%s)" % (mth))
 
     # Generate skylight well vertices for roofs, attics & plenums.
-    for greniers in [attics, plenums]:
-        k = "attic" if greniers == attics else "plenum"
+    for greniers, k in ((attics, "attic"), (plenums, "plenum")):
+        if not greniers: continue
+
+        # Subset spaces are all candidate rooms (see above). Index remaining
+        # subsets by roof & attic/plenum IDs.
+        kidx = {}
+
+        for st in ssets:
+            if k not in st or "clng" not in st or "ld" not in st: continue
+            if "pattern" not in st or st["pattern"] not in st: continue
+
+            ide = (st["roof"].nameString(), st[k].nameString())
+            kidx.setdefault(ide, []).append(st)
+
+        if not kidx: continue
 
         for grenier in greniers.values():
+            ids = grenier["space"].nameString()
+
             for roof in grenier["roofs"]:
-                sts = ssets
-                sts = [st for st in sts if "clng"        in st]
-                sts = [st for st in sts if k             in st]
-                sts = [st for st in sts if "ld"          in st]
-                sts = [st for st in sts if "space"       in st]
-                sts = [st for st in sts if "roof"        in st]
-                sts = [st for st in sts if "pattern"     in st]
-                sts = [st for st in sts if st["pattern"] in st]
-
-                ide = st["space"].nameString()
-                sts = [st for st in sts if ide      in rooms]
+                sts = kidx.get((roof.nameString(), ids), [])
                 sts = [st for st in sts if id(roof) in st["ld"]]
-
-                sts = [st for st in sts if st[k     ] == grenier["space"]]
-                sts = [st for st in sts if st["roof"] == roof]
-
                 if not sts: continue
 
                 # If successful, 'genInserts' returns extended ROOF surface
@@ -8962,7 +8967,12 @@ def addSkyLights(spaces=[], opts=dict) -> float:
 
                 roof.setVertices(vz)
 
-    # Repeat for ceilings below attic/plenum floors.
+    # Repeat for ceilings below attic/plenum floors. Point vectors used as
+    # transformation inputs are reset (not reallocated) within loops.
+    wbuf = openstudio.Point3dVector() # well wall vertices
+    vbuf = openstudio.Point3dVector() # subset roof vertices
+    cbuf = openstudio.Point3dVector() # subset cast ceiling vertices
+
     for ceiling in ceilings.values():
         k = "attic" if "attic" in ceiling else "plenum"
         greniers = attics if k == "attic" else plenums
@@ -8978,6 +8988,7 @@ def addSkyLights(spaces=[], opts=dict) -> float:
         space  = ceiling["space"] # its space
         idx    = espace.nameString()
         ide    = space.nameString()
+        idee   = clng.nameString()
         if ide not in rooms: continue
         if idx not in greniers: continue
 
@@ -8985,30 +8996,23 @@ def addSkyLights(spaces=[], opts=dict) -> float:
         grenier = greniers[idx]
         ti      = grenier["ti"]
         t0      = room["t0"]
+        t0i     = room["t0i"]
+        tii     = spz[idx]["inv"]
+        tr      = t0i * ti # attic/plenum to room coordinates
+        tf      = tii * t0 # room to attic/plenum coordinates
         stz     = []
 
         for roof in ceiling["roofs"]:
-            sts = ssets
-            sts = [st for st in sts if "clng"    in st]
-            sts = [st for st in sts if k         in st]
-            sts = [st for st in sts if "space"   in st]
-            sts = [st for st in sts if "roof"    in st]
-            sts = [st for st in sts if "pattern" in st]
-            sts = [st for st in sts if "cm2"     in st]
-            sts = [st for st in sts if "vts"     in st]
-            sts = [st for st in sts if "vtx"     in st]
-            sts = [st for st in sts if "ld"      in st]
-            sts = [st for st in sts if id(roof)  in st["ld"]]
-            sts = [st for st in sts if id(clng)  in st["ld"]]
-
-            id0 = st["space"].nameString()
-
-            sts = [st for st in sts if id0 == ide]
-            sts = [st for st in sts if id0 in rooms]
-
-            sts = [st for st in sts if st["clng"] == clng]
-            sts = [st for st in sts if st["roof"] == roof]
-            sts = [st for st in sts if st[k     ] == espace]
+            # Roof/ceiling pair subsets, if retained (i.e. neither voided nor
+            # left without a pattern). Leader line anchors ("ld") are keyed
+            # by surface 'id', so anchor lookups are O(1). Pair subsets share
+            # the ceiling's space by construction.
+            sts = pairs.get((roof.nameString(), idee), [])
+            sts = [st for st in sts if "void" not in st and "pattern" in st
+                   and k in st and "ld" in st and "vts" in st and "vtx" in st
+                   and st[k] == espace
+                   and id(roof) in st["ld"]
+                   and id(clng) in st["ld"]]
             if len(sts) != 1: continue
 
             stz.append(sts[0])
@@ -9022,8 +9026,15 @@ def addSkyLights(spaces=[], opts=dict) -> float:
             sub["sill"] = gap / 2
             if frame: sub["frame"] = frame
 
+            # Independently of the subset layout (rows x cols), individual
+            # roof inserts may be deeper than wider (or vice-versa). Adapt
+            # skylight width vs depth accordingly.
+            sw = st["w"] - f2
+            sh = st["d"] - f2
+            if round(st["d"], 2) > round(st["w"], 2): sw, sh = sh, sw
+
             for ids, vt in st["vts"].items():
-                vec = p3Dv(t0.inverse() * list(ti * vt))
+                vec = p3Dv(tr * vt)
                 roof = openstudio.model.Surface(vec, mdl)
                 roof.setSpace(space)
                 roof.setName("%s:%s" % (ids, ide))
@@ -9036,16 +9047,14 @@ def addSkyLights(spaces=[], opts=dict) -> float:
                 for j, sg in enumerate(s0):
                     sg0 = list(sg)
                     sgX = list(sX[j])
-                    vec = openstudio.Point3dVector()
-                    vec.append(sg0[ 0])
-                    vec.append(sg0[-1])
-                    vec.append(sgX[-1])
-                    vec.append(sgX[ 0])
+                    wbuf.clear()
+                    wbuf.append(sg0[ 0])
+                    wbuf.append(sg0[-1])
+                    wbuf.append(sgX[-1])
+                    wbuf.append(sgX[ 0])
 
-                    v_grenier = ti.inverse() * vec
-                    v_room    = list(t0.inverse() * vec)
-                    v_room.reverse()
-                    v_room    = p3Dv(v_room)
+                    v_grenier = tii * wbuf
+                    v_room    = p3Dv(list(reversed(t0i * wbuf)))
 
                     grenier_wall = openstudio.model.Surface(v_grenier, mdl)
                     grenier_wall.setSpace(espace)
@@ -9058,25 +9067,42 @@ def addSkyLights(spaces=[], opts=dict) -> float:
                     grenier_wall.setAdjacentSurface(room_wall)
                     room_wall.setAdjacentSurface(grenier_wall)
 
-                # Add individual skylights. Independently of the subset layout
-                # (rows x cols), individual roof inserts may be deeper than
-                # wider (or vice-versa). Adapt skylight width vs depth
-                # accordingly.
-                if round(st["d"], 2) > round(st["w"], 2):
-                    sub["width" ] = st["d"] - f2
-                    sub["height"] = st["w"] - f2
-                else:
-                    sub["width" ] = st["w"] - f2
-                    sub["height"] = st["d"] - f2
-
-                sub["id"] = roof.nameString()
+                # Add individual skylights ('addSubs' may reset sizes).
+                sub["width" ] = sw
+                sub["height"] = sh
+                sub["id"    ] = roof.nameString()
                 addSubs(roof, sub, False, True, True)
 
 
-        # Vertically-cast subset roof "vtx" onto ceiling.
+        # Vertically-cast subset roof "vtx" onto ceiling. Subset vertices are
+        # transformed all at once (both ways), rather than subset by subset.
+        # Yet each subset stems from a distinct roof (1x subset per roof/
+        # ceiling pair), i.e. not coplanar: each is cast individually.
+        cpts = p3Dv(t0 * clng.vertices())
+        ns   = []
+        vbuf.clear()
+        cbuf.clear()
+
         for st in stz:
-            cst = cast(ti * st["vtx"], t0 * clng.vertices(), ray)
-            st["cvtx"] = t0.inverse() * cst
+            for pt in st["vtx"]: vbuf.append(pt)
+
+        vtx = ti * vbuf
+        i   = 0
+
+        for st in stz:
+            n   = len(st["vtx"])
+            cst = cast(vtx[i:i + n], cpts, ray)
+            i  += n
+            ns.append(len(cst))
+
+            for pt in cst: cbuf.append(pt)
+
+        csts = t0i * cbuf
+        i    = 0
+
+        for st, n in zip(stz, ns):
+            st["cvtx"] = csts[i:i + n]
+            i += n
 
         # Extended ceiling vertices.
         vertices = genExtendedVertices(clng, stz, "cvtx")
@@ -9084,42 +9110,55 @@ def addSkyLights(spaces=[], opts=dict) -> float:
 
         # Reset ceiling and adjacent floor vertices.
         clng.setVertices(vertices)
-        fvtx = list(t0 * vertices)
-        fvtx.reverse()
-        floor.setVertices(ti.inverse() * p3Dv(fvtx))
+        floor.setVertices(p3Dv(list(reversed(tf * vertices))))
 
     # Loop through 'direct' roof surfaces of rooms to toplit (no attics or
     # plenums). No overlaps, so no relative space coordinate adjustments.
-    for ide, room in rooms.items():
+    # Direct subsets (and their index) are first grouped by roof.
+    dsets = {}
+    keys  = ("box", "cols", "rows", "d", "w", "dY", "roof")
+
+    for i, st in enumerate(ssets):
+        if "clng" in st: continue
+        if not all(key in st for key in keys): continue
+
+        dsets.setdefault(st["roof"].nameString(), []).append((i, st))
+
+    for room in rooms.values():
+        if not dsets: break
+
         for roof in room["roofs"]:
-            for i, st in enumerate(ssets):
-                if "clng"     in st: continue
-                if "box"  not in st: continue
-                if "cols" not in st: continue
-                if "rows" not in st: continue
-                if "d"    not in st: continue
-                if "w"    not in st: continue
-                if "dY"   not in st: continue
-                if "roof" not in st: continue
-
-                if st["roof"] != roof: continue
+            idr = roof.nameString()
+            if idr not in dsets: continue
 
+            for i, st in dsets[idr]:
                 w1 = st["w" ] - f2
                 d1 = st["d" ] - f2
                 dY = st["dY"]
-
-                for j in range(st["rows"]):
-                    sub           = {}
-                    sub["type"  ] = "Skylight"
-                    sub["count" ] = st["cols"]
-                    sub["width" ] = w1
-                    sub["height"] = d1
-                    sub["id"    ] = "%s:%d:%d" % (roof.nameString(), i, j)
-                    sub["sill"  ] = dY + j * (2 * dY + d1)
-
-                    if "dX" in st and st["dX"]: sub["r_buffer"] = st["dX"]
-                    if "dX" in st and st["dX"]: sub["l_buffer"] = st["dX"]
-                    if frame: sub["frame"] = frame
+                dX = st.get("dX")
+                dj = 2 * dY + d1 # row-to-row sill offset
+                di = "%s:%d:" % (idr, i)
+
+                # Row template, copied per row ('addSubs' may alter entries).
+                row           = {}
+                row["type"  ] = "Skylight"
+                row["count" ] = st["cols"]
+                row["width" ] = w1
+                row["height"] = d1
+
+                if dX:
+                    row["r_buffer"] = dX
+                    row["l_buffer"] = dX
+
+                if frame: row["frame"] = frame
+
+                nj = st["rows"] - 1
+
+                # The last (e.g. single) row takes the template itself.
+                for j in range(nj + 1):
+                    sub         = row if j == nj else dict(row)
+                    sub["id"  ] = "%s%d" % (di, j)
+                    sub["sill"] = dY + j * dj
 
                     addSubs(roof, sub, False, True, True)
 
@@ -57,6 +57,8 @@ class TestOSutModuleMethods(unittest.TestCase):
         self.assertEqual(len(osut.mass()), 4)
         self.assertEqual(osut.sidz()[5], "west")
         self.assertEqual(osut.mass()[1], "light")
+        self.assertEqual(osut.SIDZ, osut.sidz())
+        self.assertEqual(osut.MASS, osut.mass())
 
     def test03_dictionaries(self):
         self.assertEqual(len(osut.mats()),9)
@@ -66,6 +68,10 @@ class TestOSutModuleMethods(unittest.TestCase):
         self.assertTrue("skylight" in osut.film())
         self.assertTrue("skylight" in osut.uo())
         self.assertEqual(osut.film().keys(), osut.uo().keys())
+        self.assertEqual(osut.MATS, osut.mats())
+        self.assertEqual(osut.FILM, osut.film())
+        self.assertEqual(osut.UO, osut.uo())
+        with self.assertRaises(TypeError): osut.UO["door"] = 0
 
     def test04_materials(self):
         material = osut.mats()["material"]
@@ -551,6 +557,40 @@ class TestOSutModuleMethods(unittest.TestCase):
         self.assertEqual(o.status(), 0)
         del model
 
+        # 8" exterior-insulated, cladded basement wall.
+        specs = dict(type="basement", uo=0.428, clad="medium")
+        model = openstudio.model.Model()
+        c = osut.genConstruction(model, specs)
+        self.assertEqual(o.status(), 0)
+        self.assertFalse(o.logs())
+        self.assertTrue(c)
+        self.assertTrue(isinstance(c, openstudio.model.Construction))
+        self.assertEqual(c.nameString(), "OSut.CON.basement")
+        self.assertTrue(c.layers())
+        self.assertEqual(len(c.layers()), 3)
+        self.assertEqual(c.layers()[0].nameString(), "OSut.concrete.100")
+        self.assertEqual(c.layers()[1].nameString(), "OSut:K0.012:025")
+        self.assertEqual(c.layers()[2].nameString(), "OSut.concrete.200")
+        r = osut.rsi(c, osut.film()["basement"])
+        self.assertAlmostEqual(r, 1/specs["uo"], places=3)
+        self.assertFalse(o.logs())
+        self.assertEqual(o.status(), 0)
+        del model
+
+        # Massless (e.g. air space) & standard layers.
+        model   = openstudio.model.Model()
+        layers  = openstudio.model.OpaqueMaterialVector()
+        airgap  = openstudio.model.MasslessOpaqueMaterial(model)
+        drywall = openstudio.model.StandardOpaqueMaterial(model)
+        self.assertTrue(airgap.setThermalResistance(0.18))
+        layers.append(airgap)
+        layers.append(drywall)
+        c = openstudio.model.Construction(layers)
+        r = osut.rsi(c, 0.1)
+        self.assertAlmostEqual(r, 0.28 + drywall.thermalResistance(), places=3)
+        self.assertEqual(o.status(), 0)
+        del model
+
         # Standard, insulated steel door (default Uo = 1.8 W/K•m).
         specs = dict(type="door")
         model = openstudio.model.Model()
@@ -700,6 +740,14 @@ class TestOSutModuleMethods(unittest.TestCase):
 
             self.assertEqual(o.status(), 0)
 
+        # Reuse of an existing internal mass definition.
+        sps = openstudio.model.SpaceVector()
+        sps.append(lobby)
+        self.assertTrue(osut.genMass(sps, ratios["lobby"]))
+        self.assertEqual(o.status(), 0)
+        self.assertEqual(len(model.getInternalMassDefinitions()), 4)
+        self.assertEqual(len(model.getInternalMasss()), 5)
+
         construction = None
         material     = None
 
@@ -915,12 +963,30 @@ class TestOSutModuleMethods(unittest.TestCase):
         c3  = c3.get()
         c4  = c4.get()
 
+        # Construction getters cover all valid OpenStudio (sub)surface types.
+        t01 = openstudio.model.Surface.validSurfaceTypeValues()
+        t02 = openstudio.model.SubSurface.validSubSurfaceTypeValues()
+        self.assertEqual(sorted(osut._surfs), sorted(t.lower() for t in t01))
+        self.assertEqual(sorted(osut._subs ), sorted(t.lower() for t in t02))
+
         # TRUE cases:
         self.assertTrue(osut.holdsConstruction(set, c1, False, True, t1))
         self.assertTrue(osut.holdsConstruction(set, c2, False, True, t2))
         self.assertTrue(osut.holdsConstruction(set, c3, True, False, t3))
         self.assertTrue(osut.holdsConstruction(set, c4, False, True, t4))
 
+        # TRUE cases: skylight & tubular daylight diffuser sub surfaces.
+        c5 = model.getConstructionByName("000 Exterior Window")
+        c6 = model.getConstructionByName("000 Interior Window")
+        self.assertTrue(c5)
+        self.assertTrue(c6)
+        c5 = c5.get()
+        c6 = c6.get()
+        t5 = "Skylight"
+        t6 = "TubularDaylightDiffuser"
+        self.assertTrue(osut.holdsConstruction(set, c5, False, True, t5))
+        self.assertTrue(osut.holdsConstruction(set, c6, False, True, t6))
+
         # FALSE case: roofceiling as ground roof construction.
         self.assertFalse(osut.holdsConstruction(set, c1, True, False, t1))
 
@@ -963,6 +1029,13 @@ class TestOSutModuleMethods(unittest.TestCase):
         self.assertTrue(m3 in o.logs()[0]["message"])
         self.assertEqual(o.clean(), DBG)
 
+        # DEPRECATED case: 'type' keyword (instead of 'stype').
+        self.assertTrue(osut.holdsConstruction(set, c1, False, True, type=t1))
+        self.assertTrue(o.is_debug())
+        self.assertEqual(len(o.logs()), 1)
+        self.assertTrue("'type' deprecated" in o.logs()[0]["message"])
+        self.assertEqual(o.clean(), DBG)
+
         del model
         del mdl
 
@@ -1185,6 +1258,20 @@ class TestOSutModuleMethods(unittest.TestCase):
         self.assertTrue(m0 in o.logs()[0]["message"])
         self.assertEqual(o.clean(), DBG)
 
+        # Massless insulating layer.
+        layers  = openstudio.model.OpaqueMaterialVector()
+        drywall = openstudio.model.StandardOpaqueMaterial(model)
+        airgap  = openstudio.model.MasslessOpaqueMaterial(model)
+        self.assertTrue(airgap.setThermalResistance(2.0))
+        layers.append(drywall)
+        layers.append(airgap)
+        c   = openstudio.model.Construction(layers)
+        lyr = osut.insulatingLayer(c)
+        self.assertEqual(lyr["index"], 1)
+        self.assertEqual(lyr["type"], "massless")
+        self.assertAlmostEqual(lyr["r"], 2.00, places=2)
+        self.assertEqual(o.status(), 0)
+
         del model
 
     def test12_spandrels(self):
@@ -5462,6 +5549,15 @@ class TestOSutModuleMethods(unittest.TestCase):
         self.assertAlmostEqual(sky_area1, 47.57, places=2)
         self.assertAlmostEqual(ratio1, 0.01, places=2)
 
+        # Attach a shading control & additional properties to an existing
+        # skylight: both must be cleaned up when purging existing skylights.
+        sky = bulk_skies[0]
+        sc  = openstudio.model.ShadingControl(openstudio.model.Blind(model))
+        self.assertTrue(sc.addSubSurface(sky))
+        self.assertTrue(sky.additionalProperties().setFeature("osut", True))
+        self.assertEqual(sc.numberofSubSurfaces(), 1)
+        n_props = len(model.getAdditionalPropertiess())
+
         srr  = 0.04
         opts = {}
         opts["srr"  ] = srr
@@ -5469,6 +5565,9 @@ class TestOSutModuleMethods(unittest.TestCase):
         opts["clear"] = True
         rm2 = osut.addSkyLights(bulk, opts)
 
+        self.assertEqual(sc.numberofSubSurfaces(), 0)
+        self.assertEqual(len(model.getAdditionalPropertiess()), n_props - 1)
+
         bulk_skies = osut.facets(bulk, "Outdoors", "Skylight")
         sky_area2  = sum([sk.grossArea() for sk in bulk_skies])
         self.assertAlmostEqual(sky_area2, 128.19, places=2)